@@ -1,90 +1,145 @@
-from Cell import Cell
-from Direction import Direction
+from Cell import Cell, Cells
+from bitset import Bitset
+from walls import OPPOSITE, OPEN_SIDES, OPEN_COUNT, N, E, S, W, offsets
 
 
 class Canvas():
+    # Walls are stored as one 4-bit mask per cell in a flat bytearray,
+    # indexed by y * width + x (see the encoding table in a_maze_ing.py).
+    # Visited and "42" flags live in parallel bitsets with the same indexing.
     def __init__(self, width: int, height: int, entry: tuple[int, int], exit: tuple[int, int]) -> None:
         self.width: int = width
         self.height: int = height
-        self.cells: list[Cell] = []
-        self.ft_cells: list[Cell] = []
+        self.walls: bytearray = bytearray(b"\x0f") * (width * height)
+        self.visited: Bitset = Bitset(width * height)
+        self.ft: Bitset = Bitset(width * height)
+        self.cells: Cells = Cells(self)
         self.entry: tuple[int, int] = entry
         self.exit: tuple[int, int] = exit
-        self.dead_ends: set[tuple[Cell, Cell]] = set()
+        self.offset: list[int] = offsets(width)
 
-        for x in range(width):
-            for y in range(height):
-                self.cells.append(Cell(x,y))
+    def reset(self) -> None:
+        """Back to a fully closed grid, reusing the same buffers."""
+        self.walls[:] = b"\x0f" * len(self.walls)
+        self.visited.clear()
+        self.ft.clear()
+
+    def index(self, x: int, y: int) -> int:
+        return y * self.width + x
 
     def get_cell(self, x: int, y: int) -> Cell | None:
-        for cell in self.cells:
-            if cell.coordinate == (x, y):
-                return cell
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return Cell(self, x, y)
         return None
 
-    def get_neighbours(self, cell: Cell) -> list[Cell]:
-        neighbours: list[Cell | None] = []
-        if cell:
-            x = cell.coordinate[0]
-            y = cell.coordinate[1]
-
-            if x - 1 >= 0:
-                neighbours.append(self.get_cell(x-1, y))
-            if x + 1 < self.width:
-                neighbours.append(self.get_cell(x+1, y))
-            if y - 1 >= 0:
-                neighbours.append(self.get_cell(x, y-1))
-            if y + 1 < self.height:
-                neighbours.append(self.get_cell(x, y+1))
-        return [neighbour for neighbour in neighbours if neighbour]
+    @property
+    def ft_cells(self) -> list[Cell]:
+        # built on demand from the bitset, which is what the hot paths use
+        return [Cell(self, index % self.width, index // self.width) for index in self.ft]
 
-    def get_accessible_neighbours(self, cell: Cell) -> list[Cell]:
-        accessible_neighbours: list[Cell] = []
-        x, y = cell.coordinate
+    def add_ft_cell(self, cell: Cell) -> None:
+        cell.is_visited = True
+        self.ft.add(cell.index)
 
-        for neighbour in self.get_neighbours(cell):
-            nx, ny = neighbour.coordinate
+    # INDEX API (hot paths)
+    def get_neighbour_sides(self, index: int) -> list[int]:
+        width = self.width
+        x = index % width
+        sides: list[int] = []
+        if x > 0:
+            sides.append(W)
+        if x + 1 < width:
+            sides.append(E)
+        if index >= width:
+            sides.append(N)
+        if index + width < len(self.walls):
+            sides.append(S)
+        return sides
 
-            # neighbour is NORTH of cell
-            if ny == y - 1:
-                if neighbour.direction.can_see(Direction.S) and cell.direction.can_see(Direction.N):
-                    accessible_neighbours.append(neighbour)
+    def get_neighbour_indices(self, index: int) -> list[int]:
+        offset = self.offset
+        return [index + offset[side] for side in self.get_neighbour_sides(index)]
 
-            # neighbour is SOUTH of cell
-            elif ny == y + 1:
-                if neighbour.direction.can_see(Direction.N) and cell.direction.can_see(Direction.S):
-                    accessible_neighbours.append(neighbour)
+    def get_accessible_indices(self, index: int) -> list[int]:
+        walls = self.walls
+        offset = self.offset
+        accessible: list[int] = []
+        for side in OPEN_SIDES[walls[index]]:
+            neighbour = index + offset[side]
+            if not walls[neighbour] & OPPOSITE[side]:
+                accessible.append(neighbour)
+        return accessible
 
-            # neighbour is WEST of cell
-            elif nx == x - 1:
-                if neighbour.direction.can_see(Direction.E) and cell.direction.can_see(Direction.W):
-                    accessible_neighbours.append(neighbour)
+    def side_of(self, index: int, neighbour: int) -> int:
+        delta = neighbour - index
+        if delta == -self.width:
+            return N
+        if delta == self.width:
+            return S
+        if delta == 1:
+            return E
+        if delta == -1:
+            return W
+        return 0
 
-            # neighbour is EAST of cell
-            elif nx == x + 1:
-                if neighbour.direction.can_see(Direction.W) and cell.direction.can_see(Direction.E):
-                    accessible_neighbours.append(neighbour)
-        return accessible_neighbours
+    # A 3x3 block is an open area when none of its 12 inner walls is closed.
+    def is_open_block(self, left: int, top: int, index: int = -1, side: int = 0) -> bool:
+        # index/side: a wall to treat as already removed (side is E or S)
+        walls = self.walls
+        width = self.width
+        for row in range(3):
+            base = (top + row) * width + left
+            for column in range(3):
+                cell = base + column
+                mask = walls[cell] & ~side if cell == index else walls[cell]
+                if column < 2 and mask & E or row < 2 and mask & S:
+                    return False
+        return True
 
-    def remove_wall(self, cell: Cell, neighbour: Cell) -> None:
-        if neighbour in self.ft_cells:
+    def opens_area(self, index: int, side: int) -> bool:
+        """Would removing this wall complete a 3x3 open area?"""
+        neighbour = index + self.offset[side]
+        if side in (W, N):
+            index, neighbour, side = neighbour, index, OPPOSITE[side]
+        walls = self.walls
+        # Every cell of an open block has at least two inner openings.
+        if OPEN_COUNT[walls[index] & ~side] < 2 or OPEN_COUNT[walls[neighbour] & ~OPPOSITE[side]] < 2:
+            return False
+        x, y = index % self.width, index // self.width
+        if side == E:
+            lefts, tops = range(x - 1, x + 1), range(y - 2, y + 1)
+        else:
+            lefts, tops = range(x - 2, x + 1), range(y - 1, y + 1)
+        for top in tops:
+            if top < 0 or top + 2 >= self.height:
+                continue
+            for left in lefts:
+                if left >= 0 and left + 2 < self.width and self.is_open_block(left, top, index, side):
+                    return True
+        return False
+
+    def remove_wall_side(self, index: int, side: int) -> None:
+        neighbour = index + self.offset[side]
+        if self.ft[neighbour]:
             return
+        self.walls[index] &= ~side
+        self.walls[neighbour] &= ~OPPOSITE[side]
+
+    def remove_wall_at(self, index: int, neighbour: int) -> None:
+        side = self.side_of(index, neighbour)
+        if side:
+            self.remove_wall_side(index, side)
 
-        x, y = cell.coordinate[0], cell.coordinate[1]
-
-        # neighbour is WEST of cell
-        if neighbour.coordinate == (x-1, y):
-            cell.direction = Direction(cell.direction.value - 8)
-            neighbour.direction = Direction(neighbour.direction.value - 2)
-        # neighbour is NORTH of cell
-        elif neighbour.coordinate == (x, y-1):
-            cell.direction = Direction(cell.direction.value - 1)
-            neighbour.direction = Direction(neighbour.direction.value - 4)
-        # neighbour is EAST of cell
-        elif neighbour.coordinate == (x+1, y):
-            cell.direction = Direction(cell.direction.value - 2)
-            neighbour.direction = Direction(neighbour.direction.value - 8)
-        # neighbour is SOUTH of cell
-        elif neighbour.coordinate == (x, y+1):
-            cell.direction = Direction(cell.direction.value - 4)
-            neighbour.direction = Direction(neighbour.direction.value - 1)
+    # CELL API (thin views over the index API)
+    def get_neighbours(self, cell: Cell) -> list[Cell]:
+        if not cell:
+            return []
+        cells = self.cells
+        return [cells[neighbour] for neighbour in self.get_neighbour_indices(cell.index)]
+
+    def get_accessible_neighbours(self, cell: Cell) -> list[Cell]:
+        cells = self.cells
+        return [cells[neighbour] for neighbour in self.get_accessible_indices(cell.index)]
+
+    def remove_wall(self, cell: Cell, neighbour: Cell) -> None:
+        self.remove_wall_at(cell.index, neighbour.index)
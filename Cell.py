@@ -1,7 +1,65 @@
+from typing import TYPE_CHECKING, Iterator
 from Direction import Direction
 
+if TYPE_CHECKING:
+    from Canvas import Canvas
+
+
 class Cell:
-    def __init__(self, x: int, y: int) -> None:
+    """View over one cell of a Canvas; all state lives in the canvas arrays."""
+
+    __slots__ = ("canvas", "coordinate", "index")
+
+    def __init__(self, canvas: 'Canvas', x: int, y: int) -> None:
+        self.canvas = canvas
         self.coordinate = (x, y)
-        self.is_visited = False
-        self.direction = Direction.CLOSED
+        self.index = y * canvas.width + x
+
+    @property
+    def is_visited(self) -> bool:
+        return self.canvas.visited[self.index]
+
+    @is_visited.setter
+    def is_visited(self, value: bool) -> None:
+        if value:
+            self.canvas.visited.add(self.index)
+        else:
+            self.canvas.visited.discard(self.index)
+
+    @property
+    def direction(self) -> Direction:
+        return Direction(self.canvas.walls[self.index])
+
+    @direction.setter
+    def direction(self, value: Direction) -> None:
+        self.canvas.walls[self.index] = value.value
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Cell) and other.canvas is self.canvas and other.index == self.index
+
+    def __hash__(self) -> int:
+        return hash((id(self.canvas), self.index))
+
+    def __repr__(self) -> str:
+        return f"Cell{self.coordinate}"
+
+
+class Cells:
+    """Row-major sequence of Cell views, built on access."""
+
+    def __init__(self, canvas: 'Canvas') -> None:
+        self.canvas = canvas
+
+    def __len__(self) -> int:
+        return len(self.canvas.walls)
+
+    def __getitem__(self, index: int) -> Cell:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("cell index out of range")
+        return Cell(self.canvas, index % self.canvas.width, index // self.canvas.width)
+
+    def __iter__(self) -> Iterator[Cell]:
+        for index in range(len(self)):
+            yield self[index]
@@ -21,14 +21,9 @@ class Direction(Enum):
 
 
     def can_see(self, cardinal_point: 'Direction') -> bool:
-        if cardinal_point.value == Direction.S.value:
-            return self.value in (Direction.OPENED.value, Direction.S.value, Direction.SW.value, Direction.ES.value, Direction.NES.value, Direction.NSW.value, Direction.NS.value, Direction.ESW.value)
-        elif cardinal_point.value == Direction.N.value:
-            return self.value in (Direction.OPENED.value, Direction.NES.value, Direction.NEW.value, Direction.NE.value, Direction.NSW.value, Direction.NS.value, Direction.NW.value, Direction.N.value)
-        elif cardinal_point.value == Direction.E.value:
-            return self.value in (Direction.OPENED.value, Direction.NES.value, Direction.NEW.value, Direction.NE.value, Direction.ESW.value, Direction.ES.value, Direction.EW.value, Direction.E.value)
-        elif cardinal_point.value == Direction.W.value:
-            return self.value in (Direction.OPENED.value, Direction.NEW.value, Direction.NSW.value, Direction.NW.value, Direction.ESW.value, Direction.EW.value, Direction.SW.value, Direction.W.value)
+        # cardinal_point is a single-opening member (N, E, S or W);
+        # its cleared bit is the side to test.
+        return not self.value & (cardinal_point.value ^ 0xF)
 
 
     def get_unicode(self) -> str:
@@ -1,120 +1,222 @@
-from Direction import Direction
 from Canvas import Canvas
 from renderer import Renderer
-from collections import deque
 from Cell import Cell
-import dfs
+from maze_cache import MazeCache, CacheKey
+import generators
+import solver
+import braid
+import tiled
+from stats import Stats
+from stencil import Stencil, FORTY_TWO
+from topology import get_topology
 import random
+import dfs
+from events import Event
+from typing import Iterator
+from array import array
+
+
+def forty_two_coordinates(width: int, height: int) -> list[tuple[int, int]]:
+    x0, y0 = FORTY_TWO.origin(width, height)
+    return [(x0 + x, y0 + y) for x, y in FORTY_TWO.coordinates()]
 
 
 class MazeGenerator():
-    def __init__(self, seed: int | None = None) -> None:
+    def __init__(self, seed: int | None = None, cache: MazeCache | None = None, stats: Stats | None = None) -> None:
         self.seed = seed
         self.rng = random.Random(seed)
+        self.stats = stats or Stats()
+        # A maze can only be cached (or served from cache) when it is built
+        # from a freshly seeded rng.
+        self.cache = cache
+        self.rng_fresh = True
+        self.cacheable = False
+        self.cached_solution: str | None = None
+        # Custom reserved cells (set_stencil) replace the "42".
+        self.stencil: Stencil | None = None
+        self.stencil_origin: tuple[int | None, int | None] = (None, None)
+        # Share of dead ends opened in imperfect mazes.
+        self.braid_ratio = braid.BRAID_RATIO
+        # Tile edge of the "tiled" engine.
+        self.tile_size = tiled.TILE_SIZE
+        # Distance/predecessor arrays of a flood from the entry, see flood().
+        self.distance: array | None = None
+        self.predecessor: array | None = None
 
     def set_canvas(self, width: int, height: int, entry: tuple[int, int], exit: tuple[int, int]) -> None:
-        self.canvas = Canvas(width, height, entry, exit)
-        # self.cells_42: list[Cell] = []
-        if width >= 9 and height >= 7:
-            self.put_forty_two()
+        with self.stats.phase("canvas"):
+            self.canvas = Canvas(width, height, entry, exit)
+            # self.cells_42: list[Cell] = []
+            self.place_reserved()
+
+    def set_stencil(self, stencil: Stencil | None, x: int | None = None, y: int | None = None) -> None:
+        """Use stencil instead of the "42" from the next set_canvas/regenerate_maze (centred by default)."""
+        self.stencil = stencil
+        self.stencil_origin = (x, y)
+
+    def place_reserved(self) -> None:
+        if self.stencil:
+            with self.stats.phase("stencil"):
+                self.stencil.place(self.canvas, *self.stencil_origin)
+        elif self.canvas.width >= 9 and self.canvas.height >= 7:
+            with self.stats.phase("forty_two"):
+                self.put_forty_two()
+
+    @property
+    def walls(self) -> memoryview:
+        """The wall buffer itself: renderer, writers and validator read it without a copy."""
+        return memoryview(self.canvas.walls)
 
     def set_renderer(self):
         self.renderer = Renderer(self.canvas.width, self.canvas.height, self.canvas.entry, self.canvas.exit, [], "")
 
-    def generate_maze(self, perfect: bool = True) -> None:
+    def generate_maze(self, perfect: bool = True, algorithm: str = "dfs") -> None:
         self.perfect = perfect
+        self.algorithm = algorithm
+        options = {"tile_size": self.tile_size} if algorithm == "tiled" else {}
+        engine = generators.get_generator(algorithm, **options)
+        # the cache key does not describe custom stencils, braid ratios nor tile sizes
+        self.cacheable = (self.cache is not None and self.seed is not None and self.rng_fresh and not self.stencil
+                          and (perfect or self.braid_ratio == braid.BRAID_RATIO)
+                          and self.tile_size == tiled.TILE_SIZE)
+        self.rng_fresh = False
+        self.cached_solution = None
+        self.distance = self.predecessor = None
         try:
-            dfs.generate_maze(self.canvas, self.canvas.cells[0], self.rng)
-            if not perfect:
-                self.remove_dend_walls()
-            while self.has_forbidden_opened_block():
-                dfs.generate_maze(self.canvas, self.canvas.cells[0], self.rng)
+            cached = self.cache.get(self.cache_key()) if self.cache and self.cacheable else None
+            if cached:
+                walls, self.cached_solution = cached
+                self.canvas.walls[:] = walls
+                self.stats.count("cache_hits")
+            else:
+                with self.stats.phase(algorithm):
+                    engine(self.canvas, self.rng, self.stats)
                 if not perfect:
-                    self.remove_dend_walls()
+                    with self.stats.phase("dead_ends"):
+                        self.remove_dend_walls()
 
-            for y in range(self.canvas.height):
-                for x in range(self.canvas.width):
-                    cell = self.canvas.get_cell(x, y)
-                    self.renderer.cells.append(cell.direction.value)
+            self.renderer.cells = self.canvas.walls
         except AttributeError as e:
             print("Got error:", e)
 
+    def iter_generate_maze(self) -> Iterator[Event]:
+        """Perfect DFS maze as an event stream (see events.py); not cached.
+
+        The renderer is reset to the closed grid right away, so a consumer
+        such as Renderer.play() can draw the first frame before iterating.
+        """
+        self.perfect = True
+        self.algorithm = "dfs"
+        self.cacheable = self.rng_fresh = False
+        self.cached_solution = None
+        self.distance = self.predecessor = None
+        self.renderer.cells = self.canvas.walls
+
+        def stream() -> Iterator[Event]:
+            links = get_topology(self.canvas).links
+            for index in generators.unvisited_areas(self.canvas):
+                yield from dfs.iter_generate_maze(self.canvas, self.canvas.cells[index], self.rng, links)
+            self.renderer.cells = self.canvas.walls
+        return stream()
+
+    def cache_key(self) -> CacheKey:
+        # only seeded mazes are cacheable
+        assert self.seed is not None
+        canvas = self.canvas
+        return MazeCache.key(self.seed, canvas.width, canvas.height, canvas.entry, canvas.exit, self.perfect,
+                             self.algorithm)
+
     def regenerate_maze(self) -> None:
         self.rng = random.Random(self.seed)
-        self.renderer.cells = []
+        self.rng_fresh = True
+        self.stats.reset()
         self.renderer.show_path = False
-        self.set_canvas(self.canvas.width, self.canvas.height, self.canvas.entry, self.canvas.exit)
-        self.generate_maze(self.perfect)
+        # same buffer, refilled in place; generate_maze invalidates the renderer
+        with self.stats.phase("canvas"):
+            self.canvas.reset()
+            self.place_reserved()
+        self.generate_maze(self.perfect, self.algorithm)
 
     def remove_dend_walls(self) -> None:
-        if not len(self.canvas.dead_ends):
-            return
-        for _ in range(len(self.canvas.dead_ends)//3 + 1):
-            cell, neighbour = self.canvas.dead_ends.pop()
-            # print("removing dead end wall", cell.coordinate, neighbour.coordinate)
-            self.canvas.remove_wall(cell, neighbour)
-
+        braid.braid(self.canvas, self.rng, self.braid_ratio, self.stats)
 
     def put_forty_two(self) -> None:
-        x_mid = self.canvas.width // 2
-        y_mid = self.canvas.height // 2
-        cells_to_close = [
-            self.canvas.get_cell(x_mid-3, y_mid-2),
-            self.canvas.get_cell(x_mid-3, y_mid-1),
-            self.canvas.get_cell(x_mid-3, y_mid),
-            self.canvas.get_cell(x_mid-2, y_mid),
-            self.canvas.get_cell(x_mid-1, y_mid),
-            self.canvas.get_cell(x_mid-1, y_mid+1),
-            self.canvas.get_cell(x_mid-1, y_mid+2),
-
-            self.canvas.get_cell(x_mid+1, y_mid-2),
-            self.canvas.get_cell(x_mid+2, y_mid-2),
-            self.canvas.get_cell(x_mid+3, y_mid-2),
-            self.canvas.get_cell(x_mid+3, y_mid-1),
-            self.canvas.get_cell(x_mid+3, y_mid),
-            self.canvas.get_cell(x_mid+2, y_mid),
-            self.canvas.get_cell(x_mid+1, y_mid),
-            self.canvas.get_cell(x_mid+1, y_mid+1),
-            self.canvas.get_cell(x_mid+1, y_mid+2),
-            self.canvas.get_cell(x_mid+2, y_mid+2),
-            self.canvas.get_cell(x_mid+3, y_mid+2)
-        ]
-        for cell in [cell for cell in cells_to_close if cell]:
-            # self.cells_42.append(cell)
-            cell.is_visited = True
-            self.canvas.ft_cells.append(cell)
-
-    def solve_maze(self) -> None:
-        for cell in self.canvas.cells:
-            cell.is_visited = False
-        entry = self.canvas.entry
-        entry_cell = self.canvas.get_cell(entry[0], entry[1])
-        if not entry_cell:
-            return
-        queue = deque([(entry_cell, [entry_cell])])
+        FORTY_TWO.place(self.canvas)
 
-        while queue:
-            cell, path = queue.popleft()
-
-            if not cell or cell.is_visited:
-                continue
-
-            cell.is_visited = True
-
-            if cell.coordinate == self.canvas.exit:
-                self.renderer.solution = self.convert_path_to_str(path)
+    def solve_maze(self, mode: str = "bfs") -> None:
+        if self.cached_solution is not None:
+            self.renderer.solution = self.cached_solution
+            return
+        with self.stats.phase("solve"):
+            solution = solver.solve(self.canvas, mode, self.stats)
+        if solution is not None:
+            self.renderer.solution = solution
+            if self.cache and self.cacheable:
+                self.cache.put(self.cache_key(), self.canvas.walls, solution)
+                self.cacheable = False
+
+    def iter_solve_maze(self) -> Iterator[Event]:
+        """BFS solve as an event stream; sets renderer.solution once the exit is reached."""
+        entry, exit = self.canvas.get_cell(*self.canvas.entry), self.canvas.get_cell(*self.canvas.exit)
+
+        def stream() -> Iterator[Event]:
+            if not entry or not exit:
                 return
-
-            for neighbour in self.canvas.get_accessible_neighbours(cell):
-                if not neighbour.is_visited:
-                    queue.append((neighbour, path + [neighbour]))
+            path = yield from solver.iter_bfs(self.canvas, entry.index, exit.index)
+            if path is not None:
+                self.renderer.solution = solver.path_to_str(path, self.canvas.width)
+                # the stream already drew it
+                self.renderer.path_drawn = True
+        return stream()
+
+    def flood(self) -> None:
+        """One BFS from the entry; afterwards path_to() answers any exit without searching."""
+        entry = self.canvas.get_cell(*self.canvas.entry)
+        if not entry:
+            return
+        with self.stats.phase("flood"):
+            self.distance, self.predecessor = solver.flood(self.canvas, entry.index, self.stats)
+
+    def path_to(self, x: int, y: int) -> str | None:
+        if self.distance is None:
+            self.flood()
+        cell = self.canvas.get_cell(x, y)
+        if not cell or self.distance is None or self.predecessor is None:
+            return None
+        path = solver.path_to(self.distance, self.predecessor, cell.index)
+        return None if path is None else solver.path_to_str(path, self.canvas.width)
+
+    def farthest_cell(self) -> tuple[int, int] | None:
+        if self.distance is None:
+            self.flood()
+        if self.distance is None:
+            return None
+        index = solver.farthest(self.distance)
+        return index % self.canvas.width, index // self.canvas.width
+
+    def place_hardest_exits(self) -> None:
+        """Move entry and exit to the two ends of the maze diameter."""
+        canvas = self.canvas
+        entry = canvas.get_cell(*canvas.entry)
+        if not entry:
+            return
+        with self.stats.phase("diameter"):
+            first, second, _ = solver.diameter(canvas, entry.index, self.stats)
+        canvas.entry = (first % canvas.width, first // canvas.width)
+        canvas.exit = (second % canvas.width, second // canvas.width)
+        # the cache key and any stored solution were for the old pair
+        self.cacheable = False
+        self.cached_solution = None
+        self.distance = self.predecessor = None
+        self.renderer.set_markers(canvas.entry, canvas.exit)
+        self.renderer.solution = ""
 
     def has_forbidden_opened_block(self) -> bool:
-        opened = {cell.coordinate for cell in self.canvas.cells if cell.direction.value == Direction.OPENED.value}
-        for x, y in opened:
-            block = {(x + dx, y + dy) for dx in range(3) for dy in range(3)}
-            if block.issubset(opened):
-                return True
+        canvas = self.canvas
+        for top in range(canvas.height - 2):
+            for left in range(canvas.width - 2):
+                if canvas.is_open_block(left, top):
+                    return True
         return False
 
 
@@ -1,3 +1,4 @@
+import argparse
 import random
 # import dfs
 # from collections import deque
@@ -5,6 +6,11 @@ import random
 # from Cell import Cell
 # from Direction import Direction
 from MazeGenerator import MazeGenerator
+from maze_cache import MazeCache
+from stats import Stats, PROFILERS
+from generators import GENERATORS
+from stencil import Stencil
+from tiled import TILE_SIZE
 
 # Closed wall sets bit to 1, open - 0
 # Binary  Hex  W  S  E  N
@@ -45,14 +51,12 @@ from MazeGenerator import MazeGenerator
 #             print("0" if cell.is_visited else "-", end=" ")
 #         print()
 
+import sys
 from Canvas import Canvas
+from output_writer import iter_rows, write_rows
 def print_canvas_values(canvas: Canvas) -> None:
     print("\033c", end="")
-    for y in range(canvas.height):
-        for x in range(canvas.width):
-            cell = canvas.get_cell(x, y)
-            print(f"{cell.direction.value:x}".upper(), end="")
-        print()
+    write_rows(sys.stdout, iter_rows(canvas.walls, canvas.width))
 
 # def print_dead_ends(canvas: Canvas) -> None:
 #     for cell1, cell2 in canvas.dead_ends:
@@ -63,22 +67,46 @@ def print_canvas_values(canvas: Canvas) -> None:
 if __name__ == "__main__":
     # import sys
     # sys.setrecursionlimit(6000)
+    parser = argparse.ArgumentParser(description="A-Maze-ing")
+    parser.add_argument("--algorithm", choices=GENERATORS, default="dfs", help="generation engine")
+    parser.add_argument("--tile-size", type=int, default=TILE_SIZE, help="tile edge for --algorithm tiled")
+    parser.add_argument("--stats", action="store_true", help="print per-phase timings and counters")
+    parser.add_argument("--watch", action="store_true", help="animate dfs generation and solving")
+    parser.add_argument("--stencil", help="text or PBM file of reserved cells, replaces the 42")
+    parser.add_argument("--stencil-scale", type=int, default=1, help="scale the stencil by this factor")
+    parser.add_argument("--profile", choices=PROFILERS, help="wrap each phase in cProfile or tracemalloc")
+    args = parser.parse_args()
+    if args.watch and args.algorithm != "dfs":
+        parser.error("--watch only works with --algorithm dfs")
+    if args.tile_size < 1:
+        parser.error("--tile-size must be at least 1")
 
     width = 10
     height = 10
     entry = (0, 0)
     exit = (4, 4)
 
-    maze_generator = MazeGenerator(42)
+    maze_generator = MazeGenerator(42, MazeCache(maxsize=16), Stats(args.profile))
+    maze_generator.tile_size = args.tile_size
+    if args.stencil:
+        maze_generator.set_stencil(Stencil.from_file(args.stencil).scaled(args.stencil_scale))
     maze_generator.set_canvas(width, height, entry, exit)
     maze_generator.set_renderer()
-    maze_generator.generate_maze() # perfect
-    # maze_generator.generate_maze(False) # imperfect
-    maze_generator.solve_maze()
+    if args.watch:
+        maze_generator.renderer.play(maze_generator.iter_generate_maze(), per_frame=2)
+        maze_generator.renderer.play(maze_generator.iter_solve_maze(), per_frame=4)
+        input("Press Enter to continue...")
+    else:
+        maze_generator.generate_maze(algorithm=args.algorithm) # perfect
+        # maze_generator.generate_maze(False, args.algorithm) # imperfect
+        maze_generator.solve_maze()
 
     try:
         while True:
-            print_canvas_values(maze_generator.canvas)
+            with maze_generator.stats.phase("render"):
+                print_canvas_values(maze_generator.canvas)
+            if args.stats or args.profile:
+                print(maze_generator.stats.report())
             # maze_generator.renderer.render_maze()
             # render_maze(WALL_COLORS[color_index], show_path)
             print("\n=== A-Maze-ing ===")
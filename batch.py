@@ -0,0 +1,95 @@
+"""Headless batch generation: one maze per seed, spread over a process pool.
+
+Usage: python3 batch.py --size 20x15 --entry 0,0 --exit 19,14 --seeds 0:1000
+                        [--imperfect] [--hardest] [--algorithm NAME] [--tile-size N] [--jobs N]
+                        (--out-dir DIR | --concat FILE)
+"""
+
+import argparse
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from MazeGenerator import MazeGenerator
+from generators import GENERATORS
+from output_writer import write_maze
+from tiled import TILE_SIZE
+
+
+def parse_pair(text: str, separator: str = ",") -> tuple[int, int]:
+    first, second = text.split(separator)
+    return int(first), int(second)
+
+
+def parse_seeds(text: str) -> range:
+    if ":" in text:
+        start, stop = text.split(":")
+        return range(int(start), int(stop))
+    return range(int(text), int(text) + 1)
+
+
+def build_maze(seed: int, width: int, height: int, entry: tuple[int, int], exit: tuple[int, int],
+               perfect: bool, algorithm: str = "dfs", hardest: bool = False, tile_size: int = TILE_SIZE) -> str:
+    """Same steps as a_maze_ing.py, returned in the output.txt format."""
+    maze_generator = MazeGenerator(seed)
+    maze_generator.tile_size = tile_size
+    maze_generator.set_canvas(width, height, entry, exit)
+    maze_generator.set_renderer()
+    maze_generator.generate_maze(perfect, algorithm)
+    if hardest:
+        maze_generator.place_hardest_exits()
+    maze_generator.solve_maze()
+
+    canvas = maze_generator.canvas
+    text = io.StringIO()
+    write_maze(text, canvas.walls, width, canvas.entry, canvas.exit, maze_generator.renderer.solution)
+    return text.getvalue()
+
+
+def build_to_file(seed: int, out_dir: str, **options) -> str:
+    path = os.path.join(out_dir, f"maze_{seed}.txt")
+    with open(path, "w") as file:
+        file.write(build_maze(seed, **options))
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate one maze per seed in parallel.")
+    parser.add_argument("--size", required=True, type=lambda text: parse_pair(text, "x"), help="WIDTHxHEIGHT")
+    parser.add_argument("--entry", required=True, type=parse_pair, help="X,Y")
+    parser.add_argument("--exit", required=True, type=parse_pair, help="X,Y")
+    parser.add_argument("--seeds", required=True, type=parse_seeds, help="START:END (end excluded) or SEED")
+    parser.add_argument("--imperfect", action="store_true")
+    parser.add_argument("--hardest", action="store_true", help="move entry/exit to the ends of the maze diameter")
+    parser.add_argument("--algorithm", choices=GENERATORS, default="dfs")
+    parser.add_argument("--tile-size", type=int, default=TILE_SIZE, help="tile edge for --algorithm tiled")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count())
+    output = parser.add_mutually_exclusive_group(required=True)
+    output.add_argument("--out-dir", help="write maze_<seed>.txt files here")
+    output.add_argument("--concat", help="write every maze to this file, separated by blank lines")
+    args = parser.parse_args()
+    if args.tile_size < 1:
+        parser.error("--tile-size must be at least 1")
+
+    width, height = args.size
+    options = dict(width=width, height=height, entry=args.entry, exit=args.exit, perfect=not args.imperfect,
+                   algorithm=args.algorithm, hardest=args.hardest, tile_size=args.tile_size)
+    chunksize = max(1, len(args.seeds) // (4 * max(1, args.jobs)))
+
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        if args.out_dir:
+            os.makedirs(args.out_dir, exist_ok=True)
+            job = partial(build_to_file, out_dir=args.out_dir, **options)
+            for _ in pool.map(job, args.seeds, chunksize=chunksize):
+                pass
+        else:
+            job = partial(build_maze, **options)
+            with open(args.concat, "w") as file:
+                for index, text in enumerate(pool.map(job, args.seeds, chunksize=chunksize)):
+                    if index:
+                        file.write("\n")
+                    file.write(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Benchmarks for canvas setup, generation, solving, rendering and validation.
+
+Every phase runs on a fixed seed for each size, in perfect and imperfect
+mode. Timings are the best of --repeat runs, with the spread (slowest
+minus fastest) kept as a noise estimate. Results (wall time, peak memory
+the phase itself allocated, cells per second) are written as JSON and
+compared with a stored baseline: a phase fails when it is slower than
+the baseline times the tolerance and also beyond NOISE_SPREADS times the
+measured noise, or when its peak memory grew past the tolerance.
+Usage: python3 benchmark.py [--sizes 10,100,1000] [--repeat 3] [--out FILE]
+                            [--baseline FILE] [--update-baseline]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from typing import Callable
+from MazeGenerator import MazeGenerator
+from output_validator import validate
+from output_writer import write_maze
+
+SEED = 42
+DEFAULT_SIZES = [10, 50, 100, 500, 1000]
+PHASES = ["canvas", "generate", "solve", "render", "validate"]
+# Phases faster than this are too noisy to compare.
+NOISE_FLOOR = 0.05
+# A slowdown also has to exceed this many spreads (baseline or current,
+# whichever is larger) to count.
+NOISE_SPREADS = 3
+
+
+def run_pipeline(size: int, perfect: bool, measure: Callable[[str, Callable[[], None]], None]) -> None:
+    generator = MazeGenerator(SEED)
+    entry, exit = (0, 0), (size - 1, size - 1)
+
+    def canvas() -> None:
+        generator.set_canvas(size, size, entry, exit)
+        generator.set_renderer()
+        generator.renderer.delay = 0
+
+    def render() -> None:
+        with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+            generator.renderer.render_maze()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "maze.txt")
+
+        def validate_output() -> None:
+            with open(path, "w") as file:
+                write_maze(file, generator.canvas.walls, size, entry, exit, generator.renderer.solution)
+            errors = list(validate(path, connected=True, perfect=perfect, open_area=True, solution=True))
+            if errors:
+                raise RuntimeError(f"benchmark maze {size}x{size} is invalid: {errors[0]}")
+
+        measure("canvas", canvas)
+        measure("generate", lambda: generator.generate_maze(perfect))
+        measure("solve", generator.solve_maze)
+        measure("render", render)
+        measure("validate", validate_output)
+
+
+def run(sizes: list[int], memory: bool = True, repeat: int = 3) -> dict[str, dict[str, float]]:
+    results: dict[str, dict[str, float]] = {}
+    for size in sizes:
+        for perfect in (True, False):
+            mode = "perfect" if perfect else "imperfect"
+            samples: dict[str, list[float]] = {}
+
+            def timed(phase: str, step: Callable[[], None]) -> None:
+                start = time.perf_counter()
+                step()
+                samples.setdefault(phase, []).append(time.perf_counter() - start)
+
+            def traced(phase: str, step: Callable[[], None]) -> None:
+                # only what the phase adds on top of what earlier phases still hold
+                before = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                step()
+                peak = tracemalloc.get_traced_memory()[1]
+                results[f"{phase}/{size}x{size}/{mode}"]["peak_kib"] = max(peak - before, 0) // 1024
+
+            for _ in range(repeat):
+                run_pipeline(size, perfect, timed)
+            for phase, times in samples.items():
+                seconds = min(times)
+                results[f"{phase}/{size}x{size}/{mode}"] = {
+                    "seconds": round(seconds, 4),
+                    "spread": round(max(times) - seconds, 4),
+                    "cells_per_second": round(size * size / seconds) if seconds else 0,
+                }
+            if memory:
+                tracemalloc.start()
+                run_pipeline(size, perfect, traced)
+                tracemalloc.stop()
+            print(f"{size}x{size} {mode}: " + ", ".join(
+                f"{phase} {results[f'{phase}/{size}x{size}/{mode}']['seconds']}s" for phase in PHASES),
+                file=sys.stderr)
+    return results
+
+
+def compare(results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]],
+            tolerance: float) -> list[str]:
+    regressions = []
+    for key, base in baseline.items():
+        if key not in results:
+            continue
+        current = results[key]
+        noise = max(base.get("spread", 0), current.get("spread", 0))
+        limit = max(base["seconds"] * tolerance, base["seconds"] + NOISE_SPREADS * noise, NOISE_FLOOR)
+        if current["seconds"] > limit:
+            regressions.append(f"{key}: {current['seconds']}s, baseline {base['seconds']}s "
+                               f"(limit {limit:.4f}s)")
+        if "peak_kib" in base and "peak_kib" in current and current["peak_kib"] > max(base["peak_kib"] * tolerance, 64):
+            regressions.append(f"{key}: {current['peak_kib']} KiB peak, baseline {base['peak_kib']} KiB")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the maze pipeline.")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="comma-separated square sizes")
+    parser.add_argument("--out", help="write the JSON results here (default: stdout)")
+    parser.add_argument("--baseline", help="baseline JSON file to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per phase, the best one counts")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed slowdown factor")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    args = parser.parse_args()
+
+    results = run([int(size) for size in args.sizes.split(",")], memory=not args.no_memory,
+                  repeat=args.repeat)
+    report = json.dumps({"seed": SEED, "python": sys.version.split()[0], "results": results}, indent=2)
+    if args.out:
+        with open(args.out, "w") as file:
+            file.write(report + "\n")
+    else:
+        print(report)
+
+    if not args.baseline:
+        return
+    if args.update_baseline:
+        with open(args.baseline, "w") as file:
+            file.write(report + "\n")
+        return
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)["results"]
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print("REGRESSION", regression, file=sys.stderr)
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
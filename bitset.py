@@ -0,0 +1,34 @@
+class Bitset():
+    """Fixed-size set of small ints packed 8 per byte."""
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.bits = bytearray((size + 7) >> 3)
+
+    def __getitem__(self, index: int) -> bool:
+        return bool(self.bits[index >> 3] >> (index & 7) & 1)
+
+    def __contains__(self, index: int) -> bool:
+        return 0 <= index < self.size and self[index]
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __iter__(self):
+        for byte_index, byte in enumerate(self.bits):
+            while byte:
+                low = byte & -byte
+                yield (byte_index << 3) + low.bit_length() - 1
+                byte ^= low
+
+    def add(self, index: int) -> None:
+        self.bits[index >> 3] |= 1 << (index & 7)
+
+    def discard(self, index: int) -> None:
+        self.bits[index >> 3] &= ~(1 << (index & 7)) & 0xFF
+
+    def clear(self) -> None:
+        self.bits[:] = bytes(len(self.bits))
+
+    def count(self) -> int:
+        return int.from_bytes(self.bits, "little").bit_count()
@@ -0,0 +1,51 @@
+from Canvas import Canvas
+from stats import Stats
+from topology import LINKED_SIDES, get_topology
+from walls import OPEN_COUNT
+import random
+
+# Default share of dead ends opened in imperfect mazes.
+BRAID_RATIO = 1 / 3
+
+
+def find_dead_ends(canvas: Canvas) -> list[int]:
+    """Indices of cells with exactly one open side, in one pass over the walls."""
+    walls = canvas.walls
+    return [index for index in range(len(walls)) if OPEN_COUNT[walls[index]] == 1]
+
+
+def braid(canvas: Canvas, rng: random.Random, ratio: float = BRAID_RATIO, stats: Stats | None = None) -> int:
+    """Open one more wall in about ratio of the dead ends; returns the number removed.
+
+    Dead ends are visited in an order drawn from rng, so a seeded rng gives
+    the same maze every run. A wall is never opened into a reserved ("42")
+    cell nor when it would complete a 3x3 open area. Walls leading to
+    another dead end are preferred, so one removal can fix two of them.
+    """
+    walls = canvas.walls
+    offset = canvas.offset
+    links = get_topology(canvas).links
+    dead_ends = find_dead_ends(canvas)
+    rng.shuffle(dead_ends)
+    target = round(len(dead_ends) * ratio)
+    removed = skipped = 0
+
+    for index in dead_ends:
+        if removed >= target:
+            break
+        # an earlier removal may already have opened this one
+        if OPEN_COUNT[walls[index]] != 1:
+            continue
+        sides = [side for side in LINKED_SIDES[links[index]] if walls[index] & side and not canvas.opens_area(index, side)]
+        if not sides:
+            skipped += 1
+            continue
+        preferred = [side for side in sides if OPEN_COUNT[walls[index + offset[side]]] == 1]
+        canvas.remove_wall_side(index, rng.choice(preferred or sides))
+        removed += 1
+
+    if stats:
+        stats.count("dead_ends", len(dead_ends))
+        stats.count("dead_ends_skipped", skipped)
+        stats.count("walls_removed", removed)
+    return removed
@@ -1,33 +1,83 @@
+from typing import Iterator
 from Canvas import Canvas
 from Cell import Cell
+from events import Event, VISIT, CARVE, POP
+from stats import Stats
+from topology import LINKED_SIDES, get_topology
 import random
 
-def generate_maze(canvas: Canvas, start_cell: Cell, rng: random.Random) -> None:
+def generate_maze(canvas: Canvas, start_cell: Cell, rng: random.Random, stats: Stats | None = None,
+                  links: bytes | None = None) -> None:
+    """Carve the area of start_cell; links (the topology's) can be passed in by callers walking many areas."""
 
     if not canvas or not start_cell:
         return
-    
-    stack = [start_cell]
-    start_cell.is_visited = True
+
+    visited = canvas.visited.bits
+    offset = canvas.offset
+    if links is None:
+        links = get_topology(canvas).links
+    start = start_cell.index
+    stack = [start]
+    visited[start >> 3] |= 1 << (start & 7)
+    steps = pushes = peak_stack = 0
 
     while stack:
-        cell = stack[-1]
+        index = stack[-1]
+        steps += 1
+
+        sides = LINKED_SIDES[links[index]]
+        unvisited = [side for side in sides if not visited[(index + offset[side]) >> 3] >> ((index + offset[side]) & 7) & 1 and not canvas.opens_area(index, side)]
+        if unvisited:
+            side = rng.choice(unvisited)
+            neighbour = index + offset[side]
+            canvas.remove_wall_side(index, side)
+            visited[neighbour >> 3] |= 1 << (neighbour & 7)
+            stack.append(neighbour)
+            pushes += 1
+            if len(stack) > peak_stack:
+                peak_stack = len(stack)
+        else:
+            stack.pop()
+
+    if stats:
+        stats.count("dfs_steps", steps)
+        stats.count("walls_removed", pushes)
+        stats.peak("peak_stack", peak_stack)
 
-        neighbours = canvas.get_neighbours(cell)
-        unvisited = [neighbour for neighbour in neighbours if not neighbour.is_visited]
+
+def iter_generate_maze(canvas: Canvas, start_cell: Cell, rng: random.Random,
+                       links: bytes | None = None) -> Iterator[Event]:
+    """Same walk (and same maze for the same rng) as generate_maze, one event per step.
+
+    Kept as a separate loop so that generate_maze pays nothing for events.
+    """
+    if not canvas or not start_cell:
+        return
+
+    visited = canvas.visited.bits
+    offset = canvas.offset
+    if links is None:
+        links = get_topology(canvas).links
+    start = start_cell.index
+    stack = [start]
+    visited[start >> 3] |= 1 << (start & 7)
+    yield (VISIT, start, 0)
+
+    while stack:
+        index = stack[-1]
+        sides = LINKED_SIDES[links[index]]
+        unvisited = [side for side in sides if not visited[(index + offset[side]) >> 3] >> ((index + offset[side]) & 7) & 1 and not canvas.opens_area(index, side)]
         if unvisited:
-            neighbour = rng.choice(unvisited)
-            canvas.remove_wall(cell, neighbour)
-            neighbour.is_visited = True
+            side = rng.choice(unvisited)
+            neighbour = index + offset[side]
+            canvas.remove_wall_side(index, side)
+            visited[neighbour >> 3] |= 1 << (neighbour & 7)
             stack.append(neighbour)
+            yield (CARVE, index, side)
         else:
-            accessible_neighbours = set(canvas.get_accessible_neighbours(cell))
-            # inaccessible_neighbours = list(set(neighbours) - set(canvas.get_accessible_neighbours(cell)))
-            inaccessible_neighbours = [neighbour for neighbour in neighbours if neighbour not in accessible_neighbours and neighbour not in canvas.ft_cells]
-            if inaccessible_neighbours:
-                neighbour_behind_wall = rng.choice(inaccessible_neighbours)
-                canvas.dead_ends.add((cell, neighbour_behind_wall))
             stack.pop()
+            yield (POP, index, 0)
 
 
 # RecursionError
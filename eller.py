@@ -0,0 +1,120 @@
+"""Streaming perfect-maze generation with Eller's algorithm.
+
+Only the current row is kept in memory, so mazes of any height can be
+written straight to disk in the output.txt format.
+Usage: python3 eller.py <width> <height> <output_file> [seed]
+"""
+
+import random
+import sys
+from typing import Iterator
+from MazeGenerator import forty_two_coordinates
+from output_writer import format_row, write_trailer
+from walls import N, E, S, W
+
+
+def blocked_rows(coordinates: list[tuple[int, int]]) -> dict[int, set[int]]:
+    rows: dict[int, set[int]] = {}
+    for x, y in coordinates:
+        rows.setdefault(y, set()).add(x)
+    return rows
+
+
+def generate_rows(width: int, height: int, rng: random.Random,
+                  blocked: dict[int, set[int]] | None = None) -> Iterator[bytearray]:
+    # Blocked cells ("42") stay fully closed and belong to no set. A set
+    # whose cells all sit above blocked cells is first joined sideways so
+    # it can still carry on downwards.
+    blocked = blocked or {}
+    no_block: set[int] = set()
+    set_of = [0] * width
+    above_open = bytearray(width)
+    next_id = 0
+
+    for y in range(height):
+        last = y == height - 1
+        row_blocked = blocked.get(y, no_block)
+        below_blocked = blocked.get(y + 1, no_block)
+        row = bytearray(b"\x0f") * width
+        members: dict[int, list[int]] = {}
+
+        for x in range(width):
+            if x in row_blocked:
+                set_of[x] = 0
+                continue
+            if above_open[x]:
+                row[x] &= ~N
+            else:
+                next_id += 1
+                set_of[x] = next_id
+            members.setdefault(set_of[x], []).append(x)
+
+        def join(x: int) -> None:
+            row[x] &= ~E
+            row[x + 1] &= ~W
+            keep, drop = set_of[x], set_of[x + 1]
+            if len(members[keep]) < len(members[drop]):
+                keep, drop = drop, keep
+            moved = members.pop(drop)
+            for m in moved:
+                set_of[m] = keep
+            members[keep].extend(moved)
+
+        # HORIZONTAL
+        for x in range(width - 1):
+            left, right = set_of[x], set_of[x + 1]
+            if left and right and left != right and (last or rng.random() < 0.5):
+                join(x)
+
+        if last:
+            yield row
+            break
+
+        # Sets with no way down get merged with a neighbouring set.
+        if below_blocked:
+            changed = True
+            while changed:
+                changed = False
+                stranded = {s for s, cells in members.items() if all(x in below_blocked for x in cells)}
+                if not stranded:
+                    break
+                for x in range(width - 1):
+                    left, right = set_of[x], set_of[x + 1]
+                    if left and right and left != right and (left in stranded or right in stranded):
+                        join(x)
+                        changed = True
+                        break
+
+        # VERTICAL
+        above_open = bytearray(width)
+        for cells in members.values():
+            eligible = [x for x in cells if x not in below_blocked]
+            if not eligible:
+                continue
+            chosen = rng.choice(eligible)
+            for x in eligible:
+                if x == chosen or rng.random() < 0.5:
+                    row[x] &= ~S
+                    above_open[x] = 1
+        yield row
+
+
+def generate_to_file(path: str, width: int, height: int, entry: tuple[int, int], exit: tuple[int, int],
+                     seed: int | None = None) -> None:
+    rng = random.Random(seed)
+    blocked = blocked_rows(forty_two_coordinates(width, height)) if width >= 9 and height >= 7 else {}
+    with open(path, "w") as file:
+        for row in generate_rows(width, height, rng, blocked):
+            file.write(format_row(row))
+            file.write("\n")
+        write_trailer(file, entry, exit)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (4, 5):
+        print(f"Usage: python3 {sys.argv[0]} <width> <height> <output_file> [seed]")
+        sys.exit(1)
+
+    width, height = int(sys.argv[1]), int(sys.argv[2])
+    seed = int(sys.argv[4]) if len(sys.argv) == 5 else None
+    generate_to_file(sys.argv[3], width, height, (0, 0), (width - 1, height - 1), seed)
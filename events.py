@@ -0,0 +1,13 @@
+"""Generation/solving event stream: compact (kind, index, side) tuples.
+
+index is the flat cell index (y * width + x); side is a wall bit from
+walls.py, or 0 when the event has none.
+"""
+
+VISIT = 0   # cell reached (pushed on the DFS stack / BFS queue)
+CARVE = 1   # wall `side` of `index` opened, neighbour behind it reached
+POP = 2     # cell left the DFS stack
+EXPAND = 3  # cell taken off the BFS queue
+PATH = 4    # cell on the final path, entered through `side` of the previous cell
+
+Event = tuple[int, int, int]
@@ -0,0 +1,267 @@
+"""Streaming SVG and PNG export, one maze row at a time.
+
+Both exporters take the rows of wall masks as an iterable and only keep
+the previous row plus a few per-column arrays, so memory is O(width). The
+optional solution overlay keeps the path itself (which the caller already
+has as a string).
+SVG: horizontal walls are merged into runs along each row and vertical
+walls into runs down each column (one <path> per row).
+PNG: same grid as the terminal renderer (walls and cells are units of
+unit x unit pixels), palette-indexed, deflated scanline by scanline.
+Usage: python3 export.py MAZE(.txt|binary) OUT(.svg|.png) [--unit N] [--no-solution]
+"""
+
+import argparse
+import re
+import struct
+import zlib
+from array import array
+from typing import IO, Iterable, Iterator
+from maze_binary import BinaryMaze
+from output_validator import HEX_VALUES, parse_trailer
+from walls import N, E, S, W, unpack_nibbles
+
+# Unit colours (PNG palette index)
+BACKGROUND = 0
+WALL = 1
+CLOSED = 2
+SOLUTION = 3
+ENTRY = 4
+EXIT = 5
+PALETTE = bytes([255, 255, 255, 0, 0, 0, 128, 128, 128, 40, 90, 220, 200, 0, 200, 220, 30, 30])
+
+MOVES = {"N": (0, -1), "E": (1, 0), "S": (0, 1), "W": (-1, 0)}
+RUN = re.compile(b"\x01+")
+
+_SIDE = {side: bytes(1 if mask & side else 0 for mask in range(256)) for side in (N, E, S, W)}
+_FILL = bytes(CLOSED if mask == 0xF else BACKGROUND for mask in range(256))
+_IS_CLOSED = bytes(1 if mask == 0xF else 0 for mask in range(256))
+
+
+def _or(first: bytes, second: bytes) -> bytes:
+    return (int.from_bytes(first, "big") | int.from_bytes(second, "big")).to_bytes(len(first), "big")
+
+
+def _horizontal(above: bytes | None, below: bytes | None) -> bytes:
+    """1 per column where a wall separates the two rows (None: outside the maze)."""
+    if above is None:
+        assert below is not None
+        return below.translate(_SIDE[N])
+    if below is None:
+        return above.translate(_SIDE[S])
+    return _or(above.translate(_SIDE[S]), below.translate(_SIDE[N]))
+
+
+def _vertical(row: bytes) -> bytes:
+    """1 per column boundary (width + 1 of them) where a wall is."""
+    return _or(row.translate(_SIDE[W]) + b"\0", b"\0" + row.translate(_SIDE[E]))
+
+
+def _runs(flags: bytes) -> Iterator[tuple[int, int]]:
+    for match in RUN.finditer(flags):
+        yield match.start(), match.end() - match.start()
+
+
+def _stretches(solution: str) -> Iterator[tuple[str, int]]:
+    """(letter, count) for each straight stretch of the solution."""
+    for match in re.finditer(r"N+|E+|S+|W+", solution):
+        yield match.group()[0], len(match.group())
+
+
+def _path_units(entry: tuple[int, int], solution: str) -> Iterator[tuple[int, int]]:
+    """Grid units (x, y) covered by the solution, two per step (wall gap and cell)."""
+    x, y = entry[0] * 2 + 1, entry[1] * 2 + 1
+    for letter in solution:
+        dx, dy = MOVES[letter]
+        yield x + dx, y + dy
+        x, y = x + 2 * dx, y + 2 * dy
+        yield x, y
+
+
+def write_svg(file: IO[str], rows: Iterable[bytes], width: int, height: int, entry: tuple[int, int],
+              exit: tuple[int, int], solution: str | None = None, cell: int = 10) -> None:
+    margin = cell // 2
+    size = f"{width * cell + 2 * margin} {height * cell + 2 * margin}"
+    file.write(f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="{-margin} {-margin} {size}" '
+               f'width="{width * cell + 2 * margin}" height="{height * cell + 2 * margin}">\n'
+               f'<style>.closed{{fill:#888;stroke:none}}</style>\n'
+               f'<rect x="{-margin}" y="{-margin}" width="100%" height="100%" fill="#fff"/>\n'
+               f'<g fill="none" stroke="#000" stroke-width="{max(1, cell // 5)}" stroke-linecap="square">\n')
+
+    # Vertical runs stay open down each column until the wall stops.
+    run_start = array("i", [-1]) * (width + 1)
+    previous: bytes | None = None
+    previous_vertical = bytes(width + 1)
+    for y, row in enumerate(rows):
+        row = bytes(row)
+        commands = [f"M{x * cell},{y * cell}h{length * cell}" for x, length in _runs(_horizontal(previous, row))]
+        vertical = _vertical(row)
+        if vertical != previous_vertical:
+            for x, (now, before) in enumerate(zip(vertical, previous_vertical)):
+                if now and not before:
+                    run_start[x] = y
+                elif before and not now:
+                    commands.append(f"M{x * cell},{run_start[x] * cell}V{y * cell}")
+        if commands:
+            file.write(f'<path d="{"".join(commands)}"/>\n')
+        for x, length in _runs(row.translate(_IS_CLOSED)):
+            file.write(f'<rect class="closed" x="{x * cell}" y="{y * cell}" width="{length * cell}" height="{cell}"/>\n')
+        previous, previous_vertical = row, vertical
+    if previous is not None:
+        commands = [f"M{x * cell},{height * cell}h{length * cell}" for x, length in _runs(_horizontal(previous, None))]
+        commands += [f"M{x * cell},{run_start[x] * cell}V{height * cell}" for x, flag in enumerate(previous_vertical) if flag]
+        file.write(f'<path d="{"".join(commands)}"/>\n')
+    file.write("</g>\n")
+
+    half = cell // 2
+    if solution:
+        # written one stretch at a time, the path can be millions of steps
+        file.write(f'<path fill="none" stroke="#285adc" stroke-width="{max(1, cell // 3)}" '
+                   f'stroke-linejoin="round" d="M{entry[0] * cell + half},{entry[1] * cell + half}')
+        for letter, count in _stretches(solution):
+            dx, dy = MOVES[letter]
+            file.write(f"h{dx * count * cell}" if dx else f"v{dy * count * cell}")
+        file.write('"/>\n')
+    for (x, y), color in ((entry, "#c800c8"), (exit, "#dc1e1e")):
+        file.write(f'<circle cx="{x * cell + half}" cy="{y * cell + half}" r="{max(1, cell // 3)}" fill="{color}"/>\n')
+    file.write("</svg>\n")
+
+
+def _png_chunk(file: IO[bytes], kind: bytes, data: bytes) -> None:
+    file.write(struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data)))
+
+
+def write_png(file: IO[bytes], rows: Iterable[bytes], width: int, height: int, entry: tuple[int, int],
+              exit: tuple[int, int], solution: str | None = None, unit: int = 2) -> None:
+    grid_width, grid_height = width * 2 + 1, height * 2 + 1
+    file.write(b"\x89PNG\r\n\x1a\n")
+    _png_chunk(file, b"IHDR", struct.pack(">IIBBBBB", grid_width * unit, grid_height * unit, 8, 3, 0, 0, 0))
+    _png_chunk(file, b"PLTE", PALETTE)
+
+    # solution units bucketed by grid row (a counting sort, two walks of the
+    # path): the columns of row y are columns[row_start[y]:row_start[y + 1]]
+    row_start = array("i", [0]) * (grid_height + 1)
+    columns = array("i", [0]) * (2 * len(solution or ""))
+    if solution:
+        for _, y in _path_units(entry, solution):
+            row_start[y + 1] += 1
+        for y in range(grid_height):
+            row_start[y + 1] += row_start[y]
+        fill = row_start[:-1]
+        for x, y in _path_units(entry, solution):
+            columns[fill[y]] = x
+            fill[y] += 1
+        del fill
+
+    compressor = zlib.compressobj()
+    pending: list[bytes] = []
+    pending_size = 0
+
+    def emit(grid_y: int, units: bytearray) -> None:
+        nonlocal pending_size
+        for x in columns[row_start[grid_y]:row_start[grid_y + 1]]:
+            units[x] = SOLUTION
+        for (x, y), color in ((entry, ENTRY), (exit, EXIT)):
+            if y * 2 + 1 == grid_y:
+                units[x * 2 + 1] = color
+        pixels = bytearray(len(units) * unit)
+        for offset in range(unit):
+            pixels[offset::unit] = units
+        data = compressor.compress((b"\0" + pixels) * unit)
+        if data:
+            pending.append(data)
+            pending_size += len(data)
+        if pending_size > 1 << 16:
+            _png_chunk(file, b"IDAT", b"".join(pending))
+            pending.clear()
+            pending_size = 0
+
+    def wall_row(above: bytes | None, below: bytes | None) -> bytearray:
+        horizontal = _horizontal(above, below)
+        # a corner is drawn when any wall meets it
+        corners = _or(b"\0" + horizontal, horizontal + b"\0")
+        for row in (above, below):
+            if row is not None:
+                corners = _or(corners, _vertical(row))
+        units = bytearray(grid_width)
+        units[0::2] = corners
+        units[1::2] = horizontal
+        return units
+
+    previous: bytes | None = None
+    for y, row in enumerate(rows):
+        row = bytes(row)
+        emit(y * 2, wall_row(previous, row))
+        units = bytearray(grid_width)
+        units[0::2] = _vertical(row)
+        units[1::2] = row.translate(_FILL)
+        emit(y * 2 + 1, units)
+        previous = row
+    emit(grid_height - 1, wall_row(previous, None))
+
+    pending.append(compressor.flush())
+    _png_chunk(file, b"IDAT", b"".join(pending))
+    _png_chunk(file, b"IEND", b"")
+
+
+def read_maze(path: str) -> tuple[int, int, tuple[int, int], tuple[int, int], str | None, Iterator[bytes]]:
+    """(width, height, entry, exit, solution, rows) of a hex or binary maze file, rows read lazily."""
+    with open(path, "rb") as raw:
+        binary = raw.read(4) == b"AMZB"
+    if binary:
+        maze = BinaryMaze(path)
+
+        def binary_rows() -> Iterator[bytes]:
+            try:
+                for y in range(maze.height):
+                    yield bytes(unpack_nibbles(maze.row(y), maze.width))
+            finally:
+                maze.close()
+        return maze.width, maze.height, maze.entry, maze.exit, maze.solution(), binary_rows()
+
+    width = height = 0
+    with open(path) as file:
+        for line in file:
+            if not line.strip():
+                break
+            width = len(line.strip())
+            height += 1
+        trailer = [line.strip() for line in file]
+
+    def hex_rows() -> Iterator[bytes]:
+        with open(path) as file:
+            for line in file:
+                line = line.strip()
+                if not line:
+                    return
+                yield line.encode("ascii").translate(HEX_VALUES)
+    entry, exit, solution = parse_trailer(trailer)
+    return width, height, entry, exit, solution or None, hex_rows()
+
+
+def export(source: str, destination: str, unit: int = 2, show_solution: bool = True) -> None:
+    width, height, entry, exit, solution, rows = read_maze(source)
+    solution = solution if show_solution else None
+    if destination.endswith(".png"):
+        with open(destination, "wb") as file:
+            write_png(file, rows, width, height, entry, exit, solution, unit)
+    else:
+        with open(destination, "w") as file:
+            write_svg(file, rows, width, height, entry, exit, solution, unit * 5)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export a maze file to SVG or PNG.")
+    parser.add_argument("maze", help="hex (output.txt) or binary maze file")
+    parser.add_argument("output", help="destination, .svg or .png")
+    parser.add_argument("--unit", type=int, default=2, help="PNG pixels per grid unit (SVG cells are 5x this)")
+    parser.add_argument("--no-solution", action="store_true", help="leave out the solution overlay")
+    args = parser.parse_args()
+    try:
+        export(args.maze, args.output, args.unit, not args.no_solution)
+    except ValueError as e:
+        parser.exit(1, f"{args.maze}: {e}\n")
+
+
+if __name__ == "__main__":
+    main()
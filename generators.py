@@ -0,0 +1,78 @@
+"""Registry of maze generation engines, selectable by name.
+
+An engine carves a perfect maze into canvas.walls using the given rng and
+never opens a wall of a reserved ("42") cell.
+"""
+
+from functools import partial
+from typing import Callable, Iterator
+from Canvas import Canvas
+from stats import Stats
+from topology import get_topology
+import dfs
+import kruskal
+import prim
+import random
+import tiled
+import wilson
+
+Engine = Callable[[Canvas, random.Random, Stats | None], None]
+
+
+def unvisited_areas(canvas: Canvas) -> Iterator[int]:
+    """Start cells for one DFS walk per area (reserved cells may cut the grid in parts)."""
+    visited = canvas.visited.bits
+    for byte_index, byte in enumerate(visited):
+        while byte != 0xFF:
+            index = (byte_index << 3) + (~byte & (byte + 1)).bit_length() - 1
+            if index >= len(canvas.walls):
+                return
+            yield index
+            byte = visited[byte_index]
+
+
+def _dfs(canvas: Canvas, rng: random.Random, stats: Stats | None = None) -> None:
+    # looked up once: a stencil can leave thousands of areas
+    links = get_topology(canvas).links
+    for index in unvisited_areas(canvas):
+        dfs.generate_maze(canvas, canvas.cells[index], rng, stats, links)
+
+
+def _vectorized(algorithm: str) -> Engine:
+    def engine(canvas: Canvas, rng: random.Random, stats: Stats | None = None) -> None:
+        import vectorized
+        vectorized.carve_canvas(canvas, algorithm, rng.getrandbits(64))
+    return engine
+
+
+GENERATORS: dict[str, Engine] = {
+    "dfs": _dfs,
+    "kruskal": kruskal.generate_maze,
+    "prim": prim.generate_maze,
+    "wilson": wilson.generate_maze,
+    "tiled": tiled.generate_maze,
+    # need numpy
+    "binary_tree": _vectorized("binary_tree"),
+    "sidewinder": _vectorized("sidewinder"),
+}
+
+
+# Keyword options an engine takes on top of (canvas, rng, stats).
+OPTIONS: dict[str, tuple[str, ...]] = {
+    "tiled": ("tile_size", "workers"),
+}
+
+
+def register(name: str, engine: Engine, options: tuple[str, ...] = ()) -> None:
+    GENERATORS[name] = engine
+    OPTIONS[name] = options
+
+
+def get_generator(name: str, **options: int) -> Engine:
+    """The engine called name, with options bound (see OPTIONS)."""
+    if name not in GENERATORS:
+        raise ValueError(f"unknown generator {name!r}, expected one of {', '.join(GENERATORS)}")
+    unknown = [option for option in options if option not in OPTIONS.get(name, ())]
+    if unknown:
+        raise ValueError(f"generator {name!r} does not take {', '.join(unknown)}")
+    return partial(GENERATORS[name], **options) if options else GENERATORS[name]
@@ -0,0 +1,45 @@
+from array import array
+from Canvas import Canvas
+from stats import Stats
+from topology import get_topology
+import random
+
+
+def generate_maze(canvas: Canvas, rng: random.Random, stats: Stats | None = None) -> None:
+    """Randomized Kruskal: union-find with path halving over a shuffled edge list."""
+    width = canvas.width
+    size = len(canvas.walls)
+    topology = get_topology(canvas)
+    free = topology.free
+
+    # edge = index * 2 (wall to the EAST) or index * 2 + 1 (wall to the SOUTH);
+    # copied because the shuffle is in place and the topology is shared
+    edges = array("i", topology.edges)
+    rng.shuffle(edges)
+
+    parent = array("i", range(size))
+    joined = 0
+    for edge in edges:
+        index = edge >> 1
+        neighbour = index + width if edge & 1 else index + 1
+
+        root = index
+        while parent[root] != root:
+            parent[root] = parent[parent[root]]
+            root = parent[root]
+        other = neighbour
+        while parent[other] != other:
+            parent[other] = parent[parent[other]]
+            other = parent[other]
+        if root == other:
+            continue
+
+        parent[root] = other
+        canvas.remove_wall_at(index, neighbour)
+        joined += 1
+        if joined == free - 1:
+            break
+
+    if stats:
+        stats.count("walls_removed", joined)
+        stats.peak("edges", len(edges))
@@ -0,0 +1,81 @@
+"""Load test for maze_service.py: latency percentiles and throughput.
+
+Seeds are drawn from a small pool so that some requests are identical and
+exercise request merging and the cache.
+Usage: python3 load_test.py [--url http://127.0.0.1:8042] [--requests 200]
+                            [--concurrency 16] [--size 50x50] [--seeds 20] [--format hex]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from urllib.parse import urlsplit
+
+
+async def fetch(host: str, port: int, path: str) -> tuple[int, int]:
+    """(status, response size) of one GET, connection closed by the server."""
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: close\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    data = await reader.read()
+    writer.close()
+    status = int(data.split(b" ", 2)[1]) if data else 0
+    return status, len(data)
+
+
+def percentile(values: list[float], share: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(share * len(ordered)))]
+
+
+async def run(url: str, requests: int, concurrency: int, width: int, height: int, seeds: int,
+              output: str) -> None:
+    address = urlsplit(url)
+    host, port = address.hostname or "127.0.0.1", address.port or 80
+    rng = random.Random(0)
+    paths = [f"/maze?width={width}&height={height}&seed={rng.randrange(seeds)}&format={output}"
+             for _ in range(requests)]
+    latencies: list[float] = []
+    errors = 0
+    received = 0
+    limit = asyncio.Semaphore(concurrency)
+
+    async def one(path: str) -> None:
+        nonlocal errors, received
+        async with limit:
+            start = time.perf_counter()
+            try:
+                status, size = await fetch(host, port, path)
+            except OSError:
+                status, size = 0, 0
+            latencies.append(time.perf_counter() - start)
+            received += size
+            if status != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(path) for path in paths))
+    elapsed = time.perf_counter() - start
+
+    print(f"{requests} requests, concurrency {concurrency}, {width}x{height}, {seeds} distinct seeds")
+    print(f"p50 {percentile(latencies, 0.50) * 1000:.1f} ms, p99 {percentile(latencies, 0.99) * 1000:.1f} ms, "
+          f"max {max(latencies) * 1000:.1f} ms")
+    print(f"{requests / elapsed:.1f} req/s, {received / elapsed / 1024:.0f} KiB/s, errors: {errors}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load-test the maze service.")
+    parser.add_argument("--url", default="http://127.0.0.1:8042")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--size", default="50x50", help="WIDTHxHEIGHT")
+    parser.add_argument("--seeds", type=int, default=20, help="number of distinct seeds")
+    parser.add_argument("--format", choices=("hex", "binary"), default="hex")
+    args = parser.parse_args()
+    width, height = (int(value) for value in args.size.split("x"))
+    asyncio.run(run(args.url, args.requests, args.concurrency, width, height, args.seeds, args.format))
+
+
+if __name__ == "__main__":
+    main()
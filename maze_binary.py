@@ -0,0 +1,188 @@
+"""Compact binary maze format, read and written through mmap.
+
+Layout: a fixed header (see HEADER), the cells as nibble-packed rows, then
+the optional solution at 2 bits per step (N=0, E=1, S=2, W=3, first step
+in the lowest bits). Each row starts on a byte boundary with its first
+cell in the high nibble, so row.hex()[:width] is already the hex text row.
+Usage: python3 maze_binary.py (to-binary | to-hex) SOURCE DESTINATION
+"""
+
+import mmap
+import struct
+import sys
+from typing import IO, Iterator
+from output_validator import HEX_VALUES, parse_trailer
+from output_writer import write_trailer
+from walls import pack_nibbles, unpack_nibbles
+
+MAGIC = b"AMZB"
+VERSION = 1
+# magic, version, flags, width, height, entry x/y, exit x/y, seed, solution steps
+HEADER = struct.Struct("<4sBBxxIIIIIIqI")
+SEED_RANGE = range(-1 << 63, 1 << 63)
+
+PERFECT = 1
+HAS_SEED = 2
+HAS_SOLUTION = 4
+
+STEP_CODES = str.maketrans("NESW", "\0\1\2\3")
+STEPS = ["".join("NESW"[byte >> shift & 3] for shift in (0, 2, 4, 6)) for byte in range(256)]
+
+
+def pack_solution(solution: str) -> bytes:
+    codes = solution.translate(STEP_CODES).encode("ascii")
+    codes += bytes(-len(codes) % 4)
+    return bytes(a | b << 2 | c << 4 | d << 6 for a, b, c, d in zip(codes[0::4], codes[1::4], codes[2::4], codes[3::4]))
+
+
+def unpack_solution(packed: bytes | memoryview, length: int) -> str:
+    return "".join([STEPS[byte] for byte in packed])[:length]
+
+
+def pack_header(width: int, height: int, entry: tuple[int, int], exit: tuple[int, int],
+                seed: int | None = None, perfect: bool = True, solution: str | None = None) -> bytes:
+    if seed is not None and seed not in SEED_RANGE:
+        raise ValueError(f"seed {seed} does not fit in a signed 64-bit integer")
+    flags = (PERFECT if perfect else 0) | (HAS_SEED if seed is not None else 0) | (HAS_SOLUTION if solution is not None else 0)
+    return HEADER.pack(MAGIC, VERSION, flags, width, height, *entry, *exit, seed or 0, len(solution or ""))
+
+
+def write(path: str, walls: bytes | bytearray | memoryview, width: int, height: int,
+          entry: tuple[int, int], exit: tuple[int, int], seed: int | None = None,
+          perfect: bool = True, solution: str | None = None) -> None:
+    stride = (width + 1) // 2
+    steps = pack_solution(solution) if solution else b""
+    cells_end = HEADER.size + stride * height
+    header = pack_header(width, height, entry, exit, seed, perfect, solution)
+    with open(path, "w+b") as file:
+        file.truncate(cells_end + len(steps))
+        with mmap.mmap(file.fileno(), 0) as view:
+            view[:HEADER.size] = header
+            if width % 2 == 0:
+                view[HEADER.size:cells_end] = pack_nibbles(walls)
+            else:
+                for y in range(height):
+                    start = HEADER.size + y * stride
+                    view[start:start + stride] = pack_nibbles(walls[y * width:(y + 1) * width])
+            view[cells_end:] = steps
+
+
+class PackedCells():
+    """Read-only sequence of wall masks over packed rows (no unpacking copy)."""
+
+    def __init__(self, packed: memoryview, width: int, height: int) -> None:
+        self.packed = packed
+        self.width = width
+        self.stride = (width + 1) // 2
+        self.size = width * height
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int) -> int:
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        y, x = divmod(index, self.width)
+        byte = self.packed[y * self.stride + (x >> 1)]
+        return byte & 0xF if x & 1 else byte >> 4
+
+
+class BinaryMaze():
+    def __init__(self, path: str) -> None:
+        self.file = open(path, "rb")
+        self.view = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self.view[:4] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a binary maze file")
+        (_, self.version, self.flags, self.width, self.height, entry_x, entry_y, exit_x, exit_y,
+         seed, self.solution_length) = HEADER.unpack_from(self.view)
+        self.entry = (entry_x, entry_y)
+        self.exit = (exit_x, exit_y)
+        self.seed = seed if self.flags & HAS_SEED else None
+        self.perfect = bool(self.flags & PERFECT)
+        self.stride = (self.width + 1) // 2
+        cells_end = HEADER.size + self.stride * self.height
+        self.buffer = memoryview(self.view)
+        self.packed = self.buffer[HEADER.size:cells_end]
+        self.steps = self.buffer[cells_end:]
+        self.cells = PackedCells(self.packed, self.width, self.height)
+
+    def __enter__(self) -> "BinaryMaze":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def close(self) -> None:
+        for name in ("steps", "packed", "buffer"):
+            if hasattr(self, name):
+                getattr(self, name).release()
+        self.view.close()
+        self.file.close()
+
+    def row(self, y: int) -> memoryview:
+        return self.packed[y * self.stride:(y + 1) * self.stride]
+
+    def hex_row(self, y: int) -> str:
+        return self.row(y).hex()[:self.width].upper()
+
+    def hex_rows(self) -> Iterator[str]:
+        for y in range(self.height):
+            yield self.hex_row(y)
+
+    def cell(self, x: int, y: int) -> int:
+        return self.cells[y * self.width + x]
+
+    def walls(self) -> bytearray:
+        """One byte per cell, as in Canvas.walls (this one is a copy)."""
+        if self.width % 2 == 0:
+            return unpack_nibbles(self.packed, self.width * self.height)
+        walls = bytearray()
+        for y in range(self.height):
+            walls += unpack_nibbles(self.row(y), self.width)
+        return walls
+
+    def solution(self) -> str | None:
+        if not self.flags & HAS_SOLUTION:
+            return None
+        return unpack_solution(self.steps, self.solution_length)
+
+
+def read_hex(file: IO[str]) -> tuple[bytearray, int, int, tuple[int, int], tuple[int, int], str | None]:
+    """(walls, width, height, entry, exit, solution) from the hex text format."""
+    walls = bytearray()
+    width = height = 0
+    for line in file:
+        line = line.strip()
+        if not line:
+            break
+        width = len(line)
+        height += 1
+        walls += line.encode("ascii").translate(HEX_VALUES)
+    entry, exit, solution = parse_trailer([line.strip() for line in file])
+    return walls, width, height, entry, exit, solution
+
+
+def hex_to_binary(source: str, destination: str, seed: int | None = None, perfect: bool = True) -> None:
+    with open(source) as file:
+        walls, width, height, entry, exit, solution = read_hex(file)
+    write(destination, walls, width, height, entry, exit, seed, perfect, solution)
+
+
+def binary_to_hex(source: str, destination: str) -> None:
+    with BinaryMaze(source) as maze, open(destination, "w") as file:
+        for row in maze.hex_rows():
+            file.write(row)
+            file.write("\n")
+        write_trailer(file, maze.entry, maze.exit, maze.solution())
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 4 or sys.argv[1] not in ("to-binary", "to-hex"):
+        print(f"Usage: python3 {sys.argv[0]} (to-binary | to-hex) SOURCE DESTINATION")
+        sys.exit(1)
+    try:
+        (hex_to_binary if sys.argv[1] == "to-binary" else binary_to_hex)(sys.argv[2], sys.argv[3])
+    except ValueError as e:
+        print(f"{sys.argv[2]}: {e}")
+        sys.exit(1)
@@ -0,0 +1,65 @@
+"""Seed-keyed cache of generated mazes: in-memory LRU plus an optional directory."""
+
+import os
+from collections import OrderedDict
+from walls import pack_nibbles, unpack_nibbles
+
+CacheKey = tuple[int, int, int, tuple[int, int], tuple[int, int], bool, str]
+
+
+class MazeCache():
+    def __init__(self, maxsize: int = 128, directory: str | None = None) -> None:
+        self.maxsize = maxsize
+        self.directory = directory
+        self.entries: OrderedDict[CacheKey, tuple[bytes, str]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(seed: int, width: int, height: int, entry: tuple[int, int], exit: tuple[int, int],
+            perfect: bool, algorithm: str = "dfs") -> CacheKey:
+        return (seed, width, height, entry, exit, perfect, algorithm)
+
+    def _path(self, key: CacheKey) -> str:
+        seed, width, height, entry, exit, perfect, algorithm = key
+        name = f"{seed}_{width}x{height}_{entry[0]}-{entry[1]}_{exit[0]}-{exit[1]}_{'p' if perfect else 'i'}_{algorithm}.maze"
+        return os.path.join(self.directory or "", name)
+
+    def get(self, key: CacheKey) -> tuple[bytearray, str] | None:
+        """Return (walls, solution) for key, or None on a miss."""
+        count = key[1] * key[2]
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            packed, solution = self.entries[key]
+            return unpack_nibbles(packed, count), solution
+
+        if self.directory and os.path.exists(self._path(key)):
+            with open(self._path(key), "rb") as file:
+                data = file.read()
+            size = (count + 1) // 2
+            packed, solution = data[:size], data[size:].decode("ascii")
+            self._remember(key, packed, solution)
+            self.hits += 1
+            return unpack_nibbles(packed, count), solution
+
+        self.misses += 1
+        return None
+
+    def put(self, key: CacheKey, walls: bytes | bytearray | memoryview, solution: str) -> None:
+        packed = pack_nibbles(walls)
+        self._remember(key, packed, solution)
+        if self.directory:
+            path = self._path(key)
+            with open(path + ".tmp", "wb") as file:
+                file.write(packed)
+                file.write(solution.encode("ascii"))
+            os.replace(path + ".tmp", path)
+
+    def _remember(self, key: CacheKey, packed: bytes, solution: str) -> None:
+        self.entries[key] = (packed, solution)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
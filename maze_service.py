@@ -0,0 +1,209 @@
+"""Local HTTP maze service on asyncio.
+
+GET /maze?width=20&height=15&seed=42[&entry=0,0][&exit=19,14][&perfect=0]
+          [&algorithm=dfs][&format=hex|binary]
+    The maze in the output.txt format (or maze_binary.py format), sent as a
+    chunked response one row at a time.
+GET /solve?... (same parameters)
+    Only the solution line.
+GET /health
+
+Generation runs in a process pool. Identical concurrent requests share
+one job, and finished mazes are kept in a MazeCache.
+Usage: python3 maze_service.py [--host 127.0.0.1] [--port 8042] [--jobs N]
+"""
+
+import argparse
+import asyncio
+import os
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+from MazeGenerator import MazeGenerator
+from generators import GENERATORS
+from maze_binary import SEED_RANGE, pack_header, pack_solution
+from maze_cache import MazeCache, CacheKey
+from output_writer import format_row
+from walls import pack_nibbles
+
+MAX_CELLS = 4_000_000
+# rows per drain(), so a slow client holds back the writer
+DRAIN_ROWS = 64
+
+
+class BadRequest(Exception):
+    pass
+
+
+def build(key: CacheKey) -> tuple[bytes, str]:
+    """Worker side: (walls, solution) for a cache key."""
+    seed, width, height, entry, exit, perfect, algorithm = key
+    maze_generator = MazeGenerator(seed)
+    maze_generator.set_canvas(width, height, entry, exit)
+    maze_generator.set_renderer()
+    maze_generator.generate_maze(perfect, algorithm)
+    maze_generator.solve_maze()
+    return bytes(maze_generator.canvas.walls), maze_generator.renderer.solution
+
+
+def parse_key(query: str) -> tuple[CacheKey, str]:
+    params = {name: values[-1] for name, values in parse_qs(query).items()}
+    try:
+        width, height = int(params["width"]), int(params["height"])
+        seed = int(params["seed"])
+        entry = tuple(int(value) for value in params.get("entry", "0,0").split(","))
+        exit = tuple(int(value) for value in params.get("exit", f"{width - 1},{height - 1}").split(","))
+        if len(entry) != 2 or len(exit) != 2:
+            raise BadRequest("entry and exit must be given as x,y")
+    except (KeyError, ValueError) as e:
+        raise BadRequest(f"bad or missing parameter: {e}")
+    if width <= 0 or height <= 0 or width * height > MAX_CELLS:
+        raise BadRequest(f"size must be positive and at most {MAX_CELLS} cells")
+    for x, y in (entry, exit):
+        if not (0 <= x < width and 0 <= y < height):
+            raise BadRequest(f"coordinate {x},{y} is outside the maze")
+    algorithm = params.get("algorithm", "dfs")
+    if algorithm not in GENERATORS:
+        raise BadRequest(f"unknown algorithm {algorithm!r}")
+    output = params.get("format", "hex")
+    if output not in ("hex", "binary"):
+        raise BadRequest(f"unknown format {output!r}")
+    if output == "binary" and seed not in SEED_RANGE:
+        raise BadRequest("seed must fit in a signed 64-bit integer for binary output")
+    perfect = params.get("perfect", "1") not in ("0", "false", "no")
+    return MazeCache.key(seed, width, height, entry, exit, perfect, algorithm), output
+
+
+class MazeService():
+    def __init__(self, jobs: int | None = None, cache_size: int = 64) -> None:
+        self.pool = ProcessPoolExecutor(max_workers=jobs or os.cpu_count())
+        self.cache = MazeCache(maxsize=cache_size)
+        self.inflight: dict[CacheKey, asyncio.Future] = {}
+        self.jobs = 0
+        self.merged = 0
+
+    async def maze(self, key: CacheKey) -> tuple[bytes | bytearray, str]:
+        cached = self.cache.get(key)
+        if cached:
+            return cached
+        if key in self.inflight:
+            self.merged += 1
+            return await asyncio.shield(self.inflight[key])
+
+        future = asyncio.get_running_loop().run_in_executor(self.pool, build, key)
+        self.inflight[key] = future
+        self.jobs += 1
+        try:
+            walls, solution = await asyncio.shield(future)
+        finally:
+            del self.inflight[key]
+        self.cache.put(key, walls, solution)
+        return walls, solution
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request = await reader.readline()
+            while (await reader.readline()).strip():
+                pass
+            try:
+                method, target, _ = request.decode("latin-1").split(" ", 2)
+            except ValueError:
+                await self.respond(writer, 400, "malformed request line\n")
+                return
+            url = urlsplit(target)
+            if method != "GET":
+                await self.respond(writer, 405, "only GET is supported\n")
+            elif url.path == "/health":
+                await self.respond(writer, 200, f"ok jobs={self.jobs} merged={self.merged} "
+                                                f"cache_hits={self.cache.hits}\n")
+            elif url.path in ("/maze", "/solve"):
+                try:
+                    key, output = parse_key(url.query)
+                except BadRequest as e:
+                    await self.respond(writer, 400, f"{e}\n")
+                    return
+                try:
+                    walls, solution = await self.maze(key)
+                except Exception as e:
+                    await self.respond(writer, 500, f"generation failed: {e!r}\n")
+                    return
+                if url.path == "/solve":
+                    await self.respond(writer, 200, f"{solution}\n")
+                else:
+                    await self.stream(writer, key, output, walls, solution)
+            else:
+                await self.respond(writer, 404, "not found\n")
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def respond(writer: asyncio.StreamWriter, status: int, body: str) -> None:
+        data = body.encode("utf-8")
+        writer.write(f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: text/plain\r\n"
+                     f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n".encode("latin-1") + data)
+        await writer.drain()
+
+    @staticmethod
+    async def stream(writer: asyncio.StreamWriter, key: CacheKey, output: str,
+                     walls: bytes | bytearray, solution: str) -> None:
+        seed, width, height, entry, exit, perfect, _ = key
+        content_type = "application/octet-stream" if output == "binary" else "text/plain"
+        # built before the status line, so a bad header can still get an error response
+        try:
+            header = pack_header(width, height, entry, exit, seed, perfect, solution) if output == "binary" else b""
+        except ValueError as e:
+            await MazeService.respond(writer, 500, f"{e}\n")
+            return
+        writer.write(f"HTTP/1.1 200 OK\r\nContent-Type: {content_type}\r\nTransfer-Encoding: chunked\r\n"
+                     f"Connection: close\r\n\r\n".encode("latin-1"))
+
+        def chunk(data: bytes) -> None:
+            writer.write(f"{len(data):X}\r\n".encode("latin-1") + data + b"\r\n")
+
+        view = memoryview(walls)
+        if header:
+            chunk(header)
+        for y in range(height):
+            row = view[y * width:(y + 1) * width]
+            chunk(pack_nibbles(row) if output == "binary" else format_row(row).encode("ascii") + b"\n")
+            if y % DRAIN_ROWS == DRAIN_ROWS - 1:
+                await writer.drain()
+        if output == "binary":
+            if solution:
+                chunk(pack_solution(solution))
+        else:
+            chunk(f"\n{entry[0]},{entry[1]}\n{exit[0]},{exit[1]}\n{solution}\n".encode("ascii"))
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           500: "Internal Server Error"}
+
+
+async def serve(host: str, port: int, jobs: int | None) -> None:
+    service = MazeService(jobs)
+    server = await asyncio.start_server(service.handle, host, port)
+    print(f"Serving mazes on http://{host}:{port}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.pool.shutdown()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve mazes over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8042)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.jobs))
+    except KeyboardInterrupt:
+        print("\nBye!")
+
+
+if __name__ == "__main__":
+    main()
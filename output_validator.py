@@ -1,25 +1,269 @@
-# This script does not check for errors or malformed files.
-# It only validates that neighbooring cells sharing a wall have
-#  both the correct encoding.
-# Usage: python3 output_validator.py output_maze.txt
+# Streaming validator for maze output files.
+# By default it only validates that neighbooring cells sharing a wall have
+#  both the correct encoding. Optional checks: connectivity, perfection
+#  (open edges == cells - 1, fully closed "42" cells excluded), no 3x3 open
+#  area, and that the solution line follows open walls from entry to exit.
+# Only two rows are kept in memory. Each row is parsed into one big int
+#  (4 bits per cell, first cell in the highest nibble) so that every check
+#  is a handful of whole-row bit operations.
+# Binary files (maze_binary.py) are detected by their magic and read through mmap.
+# Usage: python3 output_validator.py [--connected] [--perfect] [--open-area]
+#                                    [--solution] [--all] output_maze.txt
 
+import argparse
+import mmap
 import sys
+from itertools import islice
+from typing import Callable, Iterable, Iterator
+from output_writer import format_row, iter_rows
 
-if len(sys.argv) != 2:
-    print(f"Usage: python3 {sys.argv[0]} <output_file>")
-    sys.exit(1)
-
-g = []
-for line in open(sys.argv[1]):
-    if line.strip() == '':
-        break
-    g.append([int(c, 16) for c in line.strip(' \t\n\r')])
-
-for r in range(len(g)):
-    for c in range(len(g[0])):
-        v = g[r][c]
-        if not all([(r < 1 or v & 1 == (g[r-1][c] >> 2) & 1),
-                    (c >= len(g[0])-1 or (v >> 1) & 1 == (g[r][c+1] >> 3) & 1),
-                    (r >= len(g)-1 or (v >> 2) & 1 == g[r+1][c] & 1),
-                    (c < 1 or (v >> 3) & 1 == (g[r][c-1] >> 1) & 1)]):
-            print(f'Wrong encoding for ({c},{r})')
+HEX_VALUES = bytes.maketrans(b"0123456789ABCDEFabcdef", bytes(range(16)) + bytes(range(10, 16)))
+STEPS = {"N": (0, -1, 1), "E": (1, 0, 2), "S": (0, 1, 4), "W": (-1, 0, 8)}
+
+
+def nibble_positions(flags: int, width: int) -> list[int]:
+    """Columns whose nibble has its lowest bit set in flags, left to right."""
+    columns = []
+    while flags:
+        low = flags & -flags
+        columns.append(width - 1 - (low.bit_length() - 1) // 4)
+        flags ^= low
+    columns.reverse()
+    return columns
+
+
+class Components():
+    """Row-by-row union-find that only remembers the labels of the last row."""
+
+    def __init__(self) -> None:
+        self.labels: list[int] = []
+        self.finished = 0
+
+    def feed(self, cells: bytes) -> None:
+        parent: dict[int, int] = {}
+
+        def find(label: int) -> int:
+            while parent[label] != label:
+                parent[label] = parent[parent[label]]
+                label = parent[label]
+            return label
+
+        above = self.labels
+        for label in above:
+            if label >= 0:
+                parent[label] = label
+        next_label = len(above)
+        labels = [-1] * len(cells)
+        for column, value in enumerate(cells):
+            if value == 0xF:
+                continue
+            if not value & 1 and above and above[column] >= 0:
+                label = above[column]
+            else:
+                label = next_label
+                parent[label] = label
+                next_label += 1
+            if column and not value & 8 and labels[column - 1] >= 0:
+                left = find(labels[column - 1])
+                parent[find(label)] = left
+            labels[column] = label
+
+        roots = {find(label) for label in labels if label >= 0}
+        self.finished += len({find(label) for label in above if label >= 0} - roots)
+        compact = {root: index for index, root in enumerate(sorted(roots))}
+        self.labels = [compact[find(label)] if label >= 0 else -1 for label in labels]
+
+    def count(self) -> int:
+        return self.finished + len({label for label in self.labels if label >= 0})
+
+
+def check_rows(rows: Iterable[str], connected: bool = False, perfect: bool = False,
+               open_area: bool = False) -> Iterator[str]:
+    width = 0
+    ones = e_inner = 0
+    previous = bad_previous = 0
+    components = Components()
+    cells = edges = 0
+    h3: list[int] = []
+    v3: list[int] = []
+    r = 0
+
+    for r, line in enumerate(rows):
+        if r == 0:
+            width = len(line)
+            ones = int("1" * width, 16) if width else 0
+            e_inner = (ones << 1) & ~2
+        elif len(line) != width:
+            yield f"Row {r} has {len(line)} cells, expected {width}"
+            return
+        row = int(line, 16) if width else 0
+
+        # Shared walls: E/W inside the row, S/N with the previous row.
+        mismatch = ((row ^ (row << 2)) & e_inner) >> 1
+        bad = mismatch | (mismatch >> 4)
+        if r:
+            vertical = ((previous >> 2) ^ row) & ones
+            bad_previous |= vertical
+            bad |= vertical
+            for c in nibble_positions(bad_previous, width):
+                yield f'Wrong encoding for ({c},{r - 1})'
+        bad_previous = bad
+
+        if connected:
+            components.feed(line.encode("ascii").translate(HEX_VALUES))
+
+        if perfect:
+            closed = row & (row >> 1) & (row >> 2) & (row >> 3) & ones
+            cells += width - closed.bit_count()
+            edges += (~row & e_inner).bit_count()
+            if r:
+                edges += (~previous >> 2 & ones).bit_count()
+
+        if open_area:
+            east_open = (~row & e_inner) >> 1
+            h3 = (h3 + [east_open & (east_open << 4)])[-3:]
+            if r:
+                south_open = ~previous >> 2 & ones
+                v3 = (v3 + [south_open & (south_open << 4) & (south_open << 8)])[-2:]
+            if len(h3) == 3 and len(v3) == 2:
+                block = h3[0] & h3[1] & h3[2] & v3[0] & v3[1]
+                for c in nibble_positions(block, width):
+                    yield f"3x3 open area at ({c},{r - 2})"
+
+        previous = row
+
+    for c in nibble_positions(bad_previous, width):
+        yield f'Wrong encoding for ({c},{r})'
+
+    if connected and components.count() > 1:
+        yield f"Maze is not connected: {components.count()} separate areas"
+    # fully closed cells are left out, so a 1x1 maze has no cells to connect
+    if perfect and edges != max(cells - 1, 0):
+        yield f"Maze is not perfect: {edges} open edges for {cells} cells"
+
+
+def check_walls(walls: bytes | bytearray | memoryview, width: int, connected: bool = False,
+                perfect: bool = False, open_area: bool = False) -> Iterator[str]:
+    """check_rows() straight from a wall buffer, e.g. MazeGenerator.walls."""
+    yield from check_rows((format_row(row) for row in iter_rows(walls, width)), connected, perfect, open_area)
+
+
+def check_solution(cell_at: Callable[[int, int], int], width: int, height: int,
+                   entry: tuple[int, int], exit: tuple[int, int], path: str) -> Iterator[str]:
+    x, y = entry
+    for step, letter in enumerate(path):
+        if letter not in STEPS:
+            yield f"Solution step {step}: unknown direction {letter!r}"
+            return
+        dx, dy, wall = STEPS[letter]
+        if not (0 <= x < width and 0 <= y < height) or cell_at(x, y) & wall:
+            yield f"Solution step {step}: wall {letter} of ({x},{y}) is closed"
+            return
+        x, y = x + dx, y + dy
+    if (x, y) != exit:
+        yield f"Solution ends at ({x},{y}), not at exit {exit[0]},{exit[1]}"
+
+
+def parse_coordinates(line: str) -> tuple[int, int]:
+    x, y = line.split(",")
+    return int(x), int(y)
+
+
+def parse_trailer(lines: list[str]) -> tuple[tuple[int, int], tuple[int, int], str | None]:
+    """(entry, exit, solution) from the lines after the grid; ValueError when they are missing or malformed."""
+    if len(lines) < 2:
+        raise ValueError("no entry and exit lines after the maze")
+    try:
+        entry, exit = parse_coordinates(lines[0]), parse_coordinates(lines[1])
+    except ValueError:
+        raise ValueError(f"bad entry/exit lines after the maze: {lines[0]!r}, {lines[1]!r}")
+    return entry, exit, lines[2] if len(lines) > 2 else None
+
+
+def validate_binary(path: str, connected: bool = False, perfect: bool = False, open_area: bool = False,
+                    solution: bool = False) -> Iterator[str]:
+    from maze_binary import BinaryMaze
+    with BinaryMaze(path) as maze:
+        # rows come straight from the mapped packed cells
+        yield from check_rows(maze.hex_rows(), connected, perfect, open_area)
+        if not solution:
+            return
+        path_text = maze.solution()
+        if path_text is None:
+            yield "No solution section in the file"
+            return
+        yield from check_solution(maze.cell, maze.width, maze.height, maze.entry, maze.exit, path_text)
+
+
+def validate(path: str, connected: bool = False, perfect: bool = False, open_area: bool = False,
+             solution: bool = False) -> Iterator[str]:
+    with open(path, "rb") as raw:
+        magic = raw.read(4)
+    if magic == b"AMZB":
+        yield from validate_binary(path, connected, perfect, open_area, solution)
+        return
+
+    width = height = 0
+    trailer: list[str] = []
+    with open(path) as text:
+        def grid_rows() -> Iterator[str]:
+            for line in text:
+                line = line.strip(' \t\n\r')
+                if line == '':
+                    break
+                yield line
+
+        def counted(rows: Iterator[str]) -> Iterator[str]:
+            nonlocal width, height
+            for line in rows:
+                width = len(line)
+                height += 1
+                yield line
+
+        yield from check_rows(counted(grid_rows()), connected, perfect, open_area)
+        if solution:
+            trailer = [line.strip() for line in islice(text, 3)]
+
+    if not solution:
+        return
+    if len(trailer) < 3:
+        yield "No solution line after the maze"
+        return
+    try:
+        entry, exit, _ = parse_trailer(trailer)
+    except ValueError as e:
+        yield f"Cannot check the solution: {e}"
+        return
+
+    with open(path, "rb") as raw, mmap.mmap(raw.fileno(), 0, access=mmap.ACCESS_READ) as view:
+        stride = view.find(b"\n") + 1
+        if stride != width + 1:
+            yield "Cannot check the solution: rows are not plain fixed-width lines"
+            return
+
+        def cell_at(x: int, y: int) -> int:
+            return HEX_VALUES[view[y * stride + x]]
+
+        yield from check_solution(cell_at, width, height, entry, exit, trailer[2])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Validate a maze output file.")
+    parser.add_argument("output_file")
+    parser.add_argument("--connected", action="store_true", help="every open cell is reachable")
+    parser.add_argument("--perfect", action="store_true", help="open edges == cells - 1")
+    parser.add_argument("--open-area", action="store_true", help="no 3x3 open area")
+    parser.add_argument("--solution", action="store_true", help="the solution line follows open walls")
+    parser.add_argument("--all", action="store_true", help="run every check")
+    args = parser.parse_args()
+
+    ok = True
+    for error in validate(args.output_file, args.connected or args.all, args.perfect or args.all,
+                          args.open_area or args.all, args.solution or args.all):
+        print(error)
+        ok = False
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+"""Hex output format: one row of wall masks per line, then entry, exit and path."""
+
+from typing import IO, Iterable
+
+HEX_TABLE = bytes.maketrans(bytes(range(16)), b"0123456789ABCDEF")
+
+
+def format_row(row: bytes | bytearray | memoryview) -> str:
+    return bytes(row).translate(HEX_TABLE).decode("ascii")
+
+
+def write_rows(file: IO[str], rows: Iterable[bytes | bytearray | memoryview]) -> None:
+    for row in rows:
+        file.write(format_row(row))
+        file.write("\n")
+
+
+def iter_rows(walls: bytes | bytearray | memoryview, width: int) -> Iterable[memoryview]:
+    view = memoryview(walls)
+    for start in range(0, len(view), width):
+        yield view[start:start + width]
+
+
+def write_trailer(file: IO[str], entry: tuple[int, int], exit: tuple[int, int], solution: str | None = None) -> None:
+    file.write(f"\n{entry[0]},{entry[1]}\n{exit[0]},{exit[1]}\n")
+    if solution is not None:
+        file.write(f"{solution}\n")
+
+
+def write_maze(file: IO[str], walls: bytes | bytearray | memoryview, width: int,
+               entry: tuple[int, int], exit: tuple[int, int], solution: str | None = None) -> None:
+    write_rows(file, iter_rows(walls, width))
+    write_trailer(file, entry, exit, solution)
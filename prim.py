@@ -0,0 +1,47 @@
+from Canvas import Canvas
+from bitset import Bitset
+from stats import Stats
+from topology import LINKED_SIDES, get_topology
+import random
+
+
+def generate_maze(canvas: Canvas, rng: random.Random, stats: Stats | None = None) -> None:
+    """Randomized Prim: grow one tree from a random frontier cell at a time.
+
+    Reserved cells may cut the grid in parts; each part gets its own tree.
+    """
+    from generators import unvisited_areas
+    visited = canvas.visited.bits
+    offset = canvas.offset
+    # links never point at reserved cells
+    links = get_topology(canvas).links
+    queued = Bitset(len(canvas.walls)).bits
+    frontier: list[int] = []
+
+    def add(index: int) -> None:
+        visited[index >> 3] |= 1 << (index & 7)
+        for side in LINKED_SIDES[links[index]]:
+            neighbour = index + offset[side]
+            if not visited[neighbour >> 3] >> (neighbour & 7) & 1 and not queued[neighbour >> 3] >> (neighbour & 7) & 1:
+                queued[neighbour >> 3] |= 1 << (neighbour & 7)
+                frontier.append(neighbour)
+
+    removed = peak_frontier = 0
+    for start in unvisited_areas(canvas):
+        add(start)
+        while frontier:
+            if len(frontier) > peak_frontier:
+                peak_frontier = len(frontier)
+            pick = rng.randrange(len(frontier))
+            frontier[pick], frontier[-1] = frontier[-1], frontier[pick]
+            index = frontier.pop()
+
+            in_tree = [side for side in LINKED_SIDES[links[index]]
+                       if visited[(index + offset[side]) >> 3] >> ((index + offset[side]) & 7) & 1]
+            canvas.remove_wall_side(index, rng.choice(in_tree))
+            removed += 1
+            add(index)
+
+    if stats:
+        stats.count("walls_removed", removed)
+        stats.peak("peak_frontier", peak_frontier)
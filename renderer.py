@@ -1,8 +1,12 @@
 """Terminal maze renderer using block characters."""
 
+import sys
 import time
 # from Cell import Cell
 from enum import Enum
+from typing import Iterable, Sequence
+from events import Event, VISIT, CARVE, POP, EXPAND, PATH
+from walls import DX, DY
 
 
 # PRESETS
@@ -20,6 +24,20 @@ class Presets(Enum):
     WHITE = "\033[97m"
 
 
+# GRID UNIT CLASSES (one byte per unit of the structural frame)
+EMPTY = 0
+WALL = 1
+CLOSED = 2
+ENTRY = 3
+EXIT = 4
+SOLUTION = 5
+FRONTIER = 6
+EXPLORED = 7
+
+# Unit drawn on the event's cell (CARVE and PATH also draw a wall unit)
+EVENT_UNITS = {VISIT: FRONTIER, CARVE: FRONTIER, POP: EMPTY, EXPAND: EXPLORED, PATH: SOLUTION}
+
+
 class Renderer():
     # HELPERS:
     walls = [
@@ -38,86 +56,236 @@ class Renderer():
 
     wall_colors = [Presets.WHITE, Presets.GREEN, Presets.YELLOW, Presets.CYAN]
 
-    def __init__(self, width: int, height: int, entry: tuple[int, int], exit: tuple[int, int], cells: list[int], solution: str):
+    def __init__(self, width: int, height: int, entry: tuple[int, int], exit: tuple[int, int], cells: Sequence[int], solution: str,
+                 delay: float = 0.05, incremental: bool = True):
         self.width = width
         self.height = height
         # self.entry = entry
         # self.exit_ = exit
-        self.cells = cells
-        self.solution = solution
-
         self.color_index = 0
         self.show_path = False
+        # Seconds between path steps (0 disables the sleep). In incremental
+        # mode only the cells of each step are redrawn, with cursor moves.
+        self.delay = delay
+        self.incremental = incremental
         self.grid_width = width * 2 + 1
         self.grid_height = height * 2 + 1
+        self.set_markers(entry, exit)
+
+        # Frames are built from cells/solution once and reused until either
+        # of them is replaced (call invalidate() after in-place changes).
+        self.frame: bytearray | None = None
+        self.path_frame: bytearray | None = None
+        self.frames: dict[tuple[int, bool], str] = {}
+        self.path_drawn = False
+        self.cells = cells
+        self.solution = solution
+
+    @property
+    def cells(self) -> Sequence[int]:
+        return self._cells
+
+    @cells.setter
+    def cells(self, cells: Sequence[int]) -> None:
+        # Usually the canvas wall buffer itself (no copy): call invalidate()
+        # after changing it in place.
+        self._cells = cells
+        self.invalidate()
+
+    @property
+    def solution(self) -> str:
+        return self._solution
+
+    @solution.setter
+    def solution(self, solution: str) -> None:
+        self._solution = solution
+        self.invalidate()
+
+    def set_markers(self, entry: tuple[int, int], exit: tuple[int, int]) -> None:
         self.entry_y = entry[1] * 2 + 1
         self.entry_x = entry[0] * 2 + 1
         self.exit_y = exit[1] * 2 + 1
         self.exit_x = exit[0] * 2 + 1
 
+    def scroll(self, cells: Sequence[int], entry: tuple[int, int], exit: tuple[int, int]) -> None:
+        # Viewport mode: cells is the visible window and entry/exit are
+        # relative to it, so they may fall outside and are then not drawn.
+        self.set_markers(entry, exit)
+        self.cells = cells
+
+    def invalidate(self) -> None:
+        self.frame = None
+        self.path_frame = None
+        self.frames.clear()
+        self.path_drawn = False
+
+    def palette(self) -> list[str]:
+        colored_wall = f"{self.wall_colors[self.color_index].value}{Presets.WALL.value}{Presets.RESET.value}"
+        return [
+            Presets.PATH.value,
+            colored_wall,
+            f"{Presets.GREY.value}{Presets.WALL.value}{Presets.RESET.value}",
+            f"{Presets.MAGENTA.value}{Presets.WALL.value}{Presets.RESET.value}",
+            f"{Presets.RED.value}{Presets.WALL.value}{Presets.RESET.value}",
+            f"{Presets.BLUE.value}{Presets.WALL.value}{Presets.RESET.value}",
+            f"{Presets.YELLOW.value}{Presets.WALL.value}{Presets.RESET.value}",
+            f"{Presets.CYAN.value}{Presets.WALL.value}{Presets.RESET.value}",
+        ]
+
+    def build_frame(self) -> bytearray:
+        grid_width = self.grid_width
+        frame = bytearray(grid_width * self.grid_height)
+
+        for row in range(self.height):
+            for col in range(self.width):
+                cell = self.cells[row * self.width + col]
+                y = row * 2 + 1
+                x = col * 2 + 1
+
+                for bit, wall_y, wall_x, corner_y, corner_x in self.walls:
+                    if cell & bit:
+                        frame[(y + wall_y) * grid_width + x + wall_x] = WALL
+                        frame[(y + corner_y) * grid_width + x + corner_x] = WALL
+
+                # Fully closed
+                if cell == 15:
+                    frame[y * grid_width + x] = CLOSED
+
+        # ENTRY/EXIT
+        for y, x, unit in ((self.entry_y, self.entry_x, ENTRY), (self.exit_y, self.exit_x, EXIT)):
+            if 0 < x < grid_width and 0 < y < self.grid_height:
+                frame[y * grid_width + x] = unit
+        return frame
+
+    def get_frame(self, show_path: bool) -> bytearray:
+        if self.frame is None:
+            self.frame = self.build_frame()
+        if not show_path:
+            return self.frame
+        if self.path_frame is None:
+            self.path_frame = bytearray(self.frame)
+            for wall_y, wall_x, cell_y, cell_x in self.path_steps():
+                self.path_frame[wall_y * self.grid_width + wall_x] = SOLUTION
+                self.path_frame[cell_y * self.grid_width + cell_x] = SOLUTION
+        return self.path_frame
+
+    def frame_text(self, show_path: bool) -> str:
+        key = (self.color_index, show_path)
+        if key not in self.frames:
+            self.frames[key] = self.to_text(self.get_frame(show_path))
+        return self.frames[key]
+
+    def to_text(self, frame: bytearray) -> str:
+        palette = self.palette()
+        grid_width = self.grid_width
+        rows = ["".join([palette[unit] for unit in frame[start:start + grid_width]])
+                for start in range(0, len(frame), grid_width)]
+        return "\033c" + "\n".join(rows) + "\n"
+
+    @staticmethod
+    def write(text: str) -> None:
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    @staticmethod
+    def move_to(y: int, x: int) -> str:
+        # grid units are two terminal columns wide
+        return f"\033[{y + 1};{x * 2 + 1}H"
+
+    def path_steps(self):
+        sol_y = self.entry_y
+        sol_x = self.entry_x
+        for step in self.solution:
+            step_y, step_x = self.sol_move[step]
+            # Wall unit, then cell unit
+            yield sol_y + step_y, sol_x + step_x, sol_y + 2 * step_y, sol_x + 2 * step_x
+            sol_y += 2 * step_y
+            sol_x += 2 * step_x
+
     def render_maze(self) -> None:
         try:
-            print("\033c", end="")
-            colored_wall = f"{self.wall_colors[self.color_index].value}{Presets.WALL.value}{Presets.RESET.value}"
-
-            # GRID
-            grid: list[list[str]] = [
-                [Presets.PATH.value for _ in range(self.grid_width)] for _ in range(self.grid_height)
-            ]
-
-            for row in range(self.height):
-                for col in range(self.width):
-                    cell = self.cells[row * self.width + col]
-                    y = row * 2 + 1
-                    x = col * 2 + 1
-
-                    for bit, wall_y, wall_x, corner_y, corner_x in self.walls:
-                        if cell & bit:
-                            grid[y + wall_y][x + wall_x] = colored_wall
-                            grid[y + corner_y][x + corner_x] = colored_wall
-
-                    # Fully closed
-                    if cell == 15:
-                        grid[y][x] = f"{Presets.GREY.value}{Presets.WALL.value}{Presets.RESET.value}"
-
-            # ENTRY/EXIT
-            grid[self.entry_y][self.entry_x] = f"{Presets.MAGENTA.value}{Presets.WALL.value}{Presets.RESET.value}"
-            grid[self.exit_y][self.exit_x] = f"{Presets.RED.value}{Presets.WALL.value}{Presets.RESET.value}"
-
-            # SOLUTION PATH
-            if self.show_path:
-                sol_y = self.entry_y
-                sol_x = self.entry_x
-                for step in self.solution:
-                    step_y, step_x = self.sol_move[step]
-
-                    # Wall unit
-                    sol_y += step_y
-                    sol_x += step_x
-                    grid[sol_y][sol_x] = f"{Presets.BLUE.value}{Presets.WALL.value}{Presets.RESET.value}"
-
-                    # Cell unit
-                    sol_y += step_y
-                    sol_x += step_x
-                    grid[sol_y][sol_x] = f"{Presets.BLUE.value}{Presets.WALL.value}{Presets.RESET.value}"
-
-                    # Draw path
-                    print("\033c", end="")
-                    for row_printed in grid:
-                        print("".join(row_printed))
-                    time.sleep(0.05)
-                # return
+            # SOLUTION PATH (animated the first time it is shown)
+            if self.show_path and not self.path_drawn:
+                self.animate_path()
+                self.path_drawn = True
+                return
 
             # DRAW
-            print("\033c", end="")
-            for row_printed in grid:
-                print("".join(row_printed))
+            self.write(self.frame_text(self.show_path))
         except KeyboardInterrupt:
             print("Bye!\n")
             exit(1)
         except Exception as e:
             print("Got an error while rendering:", e)
 
+    def animate_path(self) -> None:
+        path_unit = self.palette()[SOLUTION]
+        if self.incremental:
+            self.write(self.frame_text(False))
+            for wall_y, wall_x, cell_y, cell_x in self.path_steps():
+                self.write(f"{self.move_to(wall_y, wall_x)}{path_unit}{self.move_to(cell_y, cell_x)}{path_unit}")
+                if self.delay:
+                    time.sleep(self.delay)
+            self.write(self.move_to(self.grid_height, 0))
+            return
+
+        frame = bytearray(self.get_frame(False))
+        for wall_y, wall_x, cell_y, cell_x in self.path_steps():
+            frame[wall_y * self.grid_width + wall_x] = SOLUTION
+            frame[cell_y * self.grid_width + cell_x] = SOLUTION
+
+            # Draw path
+            self.write(self.to_text(frame))
+            if self.delay:
+                time.sleep(self.delay)
+        self.write(self.frame_text(True))
+
+    def play(self, events: Iterable[Event], fps: float = 30.0, per_frame: int | None = None) -> None:
+        """Draw a generation/solving event stream (see events.py) over the current frame.
+
+        Changed units are collected and written together, one write per
+        frame. Without per_frame the stream runs as fast as it is produced
+        and a frame is flushed at most fps times per second; with per_frame
+        every frame applies that many events and waits for the next tick.
+        """
+        palette = self.palette()
+        width = self.width
+        markers = {(self.entry_y, self.entry_x), (self.exit_y, self.exit_x)}
+        pending: dict[tuple[int, int], int] = {}
+        interval = 1 / fps if fps else 0.0
+        last = time.monotonic()
+        count = 0
+
+        def flush() -> None:
+            self.write("".join([f"{self.move_to(y, x)}{palette[unit]}" for (y, x), unit in pending.items()]))
+            pending.clear()
+
+        self.write(self.frame_text(False))
+        for kind, index, side in events:
+            y, x = index // width * 2 + 1, index % width * 2 + 1
+            if kind == CARVE:
+                pending[(y + DY[side], x + DX[side])] = EMPTY
+                y, x = y + 2 * DY[side], x + 2 * DX[side]
+            elif kind == PATH and side:
+                pending[(y - DY[side], x - DX[side])] = SOLUTION
+            if (y, x) not in markers:
+                pending[(y, x)] = EVENT_UNITS[kind]
+
+            count += 1
+            if per_frame:
+                if count % per_frame:
+                    continue
+                flush()
+                wait = last + interval - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+                last = time.monotonic()
+            elif time.monotonic() - last >= interval:
+                flush()
+                last = time.monotonic()
+        flush()
+        self.write(self.move_to(self.grid_height, 0))
+
 
 # hex_strings = [
 #     "9", "5", "1", "5", "3", "9", "1", "5", "3", "9", "5", "5", "1", "7", "9", "5", "1", "5", "1", "1", "5", "1", "1", "5", "3",
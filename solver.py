@@ -0,0 +1,245 @@
+"""Shortest-path solvers over the canvas wall array.
+
+Each solver keeps a flat predecessor array and a visited bitset and only
+builds the path once the goal is reached.
+"""
+
+import heapq
+from array import array
+from collections import deque
+from typing import Callable, Generator
+from Canvas import Canvas
+from bitset import Bitset
+from events import Event, VISIT, EXPAND, PATH
+from stats import Stats
+from walls import OPEN_SIDES, OPPOSITE
+
+
+def _record(stats: Stats | None, expanded: int, peak_queue: int) -> None:
+    if stats:
+        stats.count("bfs_expanded", expanded)
+        stats.peak("peak_queue", peak_queue)
+
+
+def _walk_back(predecessor: array, start: int, goal: int) -> list[int]:
+    path = [goal]
+    while path[-1] != start:
+        path.append(predecessor[path[-1]])
+    path.reverse()
+    return path
+
+
+def bfs(canvas: Canvas, start: int, goal: int, stats: Stats | None = None) -> list[int] | None:
+    walls = canvas.walls
+    offset = canvas.offset
+    visited = Bitset(len(walls))
+    seen = visited.bits
+    predecessor = array("i", [-1]) * len(walls)
+    seen[start >> 3] |= 1 << (start & 7)
+    queue = deque([start])
+    expanded = peak_queue = 0
+    path = None
+
+    while queue:
+        if len(queue) > peak_queue:
+            peak_queue = len(queue)
+        index = queue.popleft()
+        expanded += 1
+        if index == goal:
+            path = _walk_back(predecessor, start, goal)
+            break
+        for side in OPEN_SIDES[walls[index]]:
+            neighbour = index + offset[side]
+            if not walls[neighbour] & OPPOSITE[side] and not seen[neighbour >> 3] >> (neighbour & 7) & 1:
+                seen[neighbour >> 3] |= 1 << (neighbour & 7)
+                predecessor[neighbour] = index
+                queue.append(neighbour)
+    _record(stats, expanded, peak_queue)
+    return path
+
+
+def bidirectional(canvas: Canvas, start: int, goal: int, stats: Stats | None = None) -> list[int] | None:
+    # Grows the smaller of the two frontiers one level at a time.
+    if start == goal:
+        return [start]
+    walls = canvas.walls
+    offset = canvas.offset
+    size = len(walls)
+    sides = []
+    for origin in (start, goal):
+        visited = Bitset(size)
+        visited.add(origin)
+        sides.append((visited.bits, array("i", [-1]) * size, [origin]))
+    expanded = peak_queue = 0
+
+    while sides[0][2] and sides[1][2]:
+        grow = 0 if len(sides[0][2]) <= len(sides[1][2]) else 1
+        seen, predecessor, frontier = sides[grow]
+        other_seen = sides[1 - grow][0]
+        next_frontier: list[int] = []
+        peak_queue = max(peak_queue, len(sides[0][2]) + len(sides[1][2]))
+        for index in frontier:
+            expanded += 1
+            for side in OPEN_SIDES[walls[index]]:
+                neighbour = index + offset[side]
+                if walls[neighbour] & OPPOSITE[side] or seen[neighbour >> 3] >> (neighbour & 7) & 1:
+                    continue
+                seen[neighbour >> 3] |= 1 << (neighbour & 7)
+                predecessor[neighbour] = index
+                if other_seen[neighbour >> 3] >> (neighbour & 7) & 1:
+                    head = _walk_back(sides[0][1], start, neighbour)
+                    tail = _walk_back(sides[1][1], goal, neighbour)
+                    tail.reverse()
+                    _record(stats, expanded, peak_queue)
+                    return head + tail[1:]
+                next_frontier.append(neighbour)
+        sides[grow] = (seen, predecessor, next_frontier)
+    _record(stats, expanded, peak_queue)
+    return None
+
+
+def astar(canvas: Canvas, start: int, goal: int, stats: Stats | None = None) -> list[int] | None:
+    # Manhattan distance never overestimates on a grid, so the first pop of
+    # the goal is a shortest path.
+    walls = canvas.walls
+    offset = canvas.offset
+    width = canvas.width
+    goal_x, goal_y = goal % width, goal // width
+    closed = Bitset(len(walls))
+    done = closed.bits
+    predecessor = array("i", [-1]) * len(walls)
+    cost = array("i", [-1]) * len(walls)
+    cost[start] = 0
+    heap = [(abs(start % width - goal_x) + abs(start // width - goal_y), 0, start)]
+    expanded = peak_queue = 0
+    path = None
+
+    while heap:
+        if len(heap) > peak_queue:
+            peak_queue = len(heap)
+        _, g, index = heapq.heappop(heap)
+        if done[index >> 3] >> (index & 7) & 1:
+            continue
+        expanded += 1
+        if index == goal:
+            path = _walk_back(predecessor, start, goal)
+            break
+        done[index >> 3] |= 1 << (index & 7)
+        g += 1
+        for side in OPEN_SIDES[walls[index]]:
+            neighbour = index + offset[side]
+            if walls[neighbour] & OPPOSITE[side] or done[neighbour >> 3] >> (neighbour & 7) & 1:
+                continue
+            if cost[neighbour] == -1 or g < cost[neighbour]:
+                cost[neighbour] = g
+                predecessor[neighbour] = index
+                h = abs(neighbour % width - goal_x) + abs(neighbour // width - goal_y)
+                heapq.heappush(heap, (g + h, g, neighbour))
+    _record(stats, expanded, peak_queue)
+    return path
+
+
+def iter_bfs(canvas: Canvas, start: int, goal: int) -> Generator[Event, None, list[int] | None]:
+    """bfs() as an event stream; the path is the generator's return value."""
+    walls = canvas.walls
+    offset = canvas.offset
+    predecessor = array("i", [-1]) * len(walls)
+    predecessor[start] = start
+    queue = deque([start])
+    yield (VISIT, start, 0)
+
+    while queue:
+        index = queue.popleft()
+        yield (EXPAND, index, 0)
+        if index == goal:
+            path = _walk_back(predecessor, start, goal)
+            yield (PATH, start, 0)
+            for previous, cell in zip(path, path[1:]):
+                yield (PATH, cell, canvas.side_of(previous, cell))
+            return path
+        for side in OPEN_SIDES[walls[index]]:
+            neighbour = index + offset[side]
+            if predecessor[neighbour] < 0 and not walls[neighbour] & OPPOSITE[side]:
+                predecessor[neighbour] = index
+                queue.append(neighbour)
+                yield (VISIT, neighbour, 0)
+    return None
+
+
+def flood(canvas: Canvas, start: int, stats: Stats | None = None) -> tuple[array, array]:
+    """BFS from start over the whole maze: (distance, predecessor), -1 where unreachable."""
+    walls = canvas.walls
+    offset = canvas.offset
+    distance = array("i", [-1]) * len(walls)
+    predecessor = array("i", [-1]) * len(walls)
+    distance[start] = 0
+    queue = deque([start])
+    peak_queue = 0
+
+    while queue:
+        if len(queue) > peak_queue:
+            peak_queue = len(queue)
+        index = queue.popleft()
+        step = distance[index] + 1
+        for side in OPEN_SIDES[walls[index]]:
+            neighbour = index + offset[side]
+            if distance[neighbour] < 0 and not walls[neighbour] & OPPOSITE[side]:
+                distance[neighbour] = step
+                predecessor[neighbour] = index
+                queue.append(neighbour)
+    if stats:
+        stats.count("flood_cells", sum(1 for value in distance if value >= 0))
+        stats.peak("peak_queue", peak_queue)
+    return distance, predecessor
+
+
+def path_to(distance: array, predecessor: array, goal: int) -> list[int] | None:
+    """Path from the flood origin to goal, in O(path length)."""
+    if distance[goal] < 0:
+        return None
+    path = [goal]
+    while predecessor[path[-1]] >= 0:
+        path.append(predecessor[path[-1]])
+    path.reverse()
+    return path
+
+
+def farthest(distance: array) -> int:
+    # first index at the largest distance
+    return distance.index(max(distance))
+
+
+def diameter(canvas: Canvas, start: int, stats: Stats | None = None) -> tuple[int, int, int]:
+    """(a, b, length) of the longest shortest path reachable from start.
+
+    Two floods: the farthest cell from anywhere is one end of a longest
+    path in a tree. Exact for perfect mazes, a good lower bound otherwise.
+    """
+    first = farthest(flood(canvas, start, stats)[0])
+    distance = flood(canvas, first, stats)[0]
+    second = farthest(distance)
+    return first, second, distance[second]
+
+
+SOLVERS: dict[str, Callable[..., list[int] | None]] = {
+    "bfs": bfs,
+    "bidirectional": bidirectional,
+    "astar": astar,
+}
+
+
+def path_to_str(path: list[int], width: int) -> str:
+    letters = {-1: "W", 1: "E", -width: "N", width: "S"}
+    return "".join(letters[nxt - cur] for cur, nxt in zip(path, path[1:]))
+
+
+def solve(canvas: Canvas, mode: str = "bfs", stats: Stats | None = None) -> str | None:
+    if mode not in SOLVERS:
+        raise ValueError(f"unknown solver {mode!r}, expected one of {', '.join(SOLVERS)}")
+    entry, exit = canvas.get_cell(*canvas.entry), canvas.get_cell(*canvas.exit)
+    if not entry or not exit:
+        return None
+    path = SOLVERS[mode](canvas, entry.index, exit.index, stats)
+    if path is None:
+        return None
+    return path_to_str(path, canvas.width)
@@ -0,0 +1,81 @@
+"""Per-phase timers, counters and optional profiling hooks."""
+
+import cProfile
+import io
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Iterator
+
+PROFILERS = ("cprofile", "tracemalloc")
+
+
+class Stats():
+    def __init__(self, profiler: str | None = None, profile_phases: set[str] | None = None) -> None:
+        """profiler wraps every phase (or only profile_phases) in cProfile or tracemalloc."""
+        if profiler not in (None, *PROFILERS):
+            raise ValueError(f"unknown profiler {profiler!r}, expected one of {', '.join(PROFILERS)}")
+        self.profiler = profiler
+        self.profile_phases = profile_phases
+        # Only the outermost hooked phase is profiled when phases nest.
+        self.profiling = False
+        self.reset()
+
+    def reset(self) -> None:
+        self.timings: dict[str, float] = {}
+        self.counters: dict[str, int] = {}
+        self.memory: dict[str, int] = {}
+        self.profiles: dict[str, str] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        hooked = self.profiler and (self.profile_phases is None or name in self.profile_phases)
+        profile = None
+        tracing = False
+        if hooked and self.profiler == "cprofile" and not self.profiling:
+            self.profiling = True
+            profile = cProfile.Profile()
+            profile.enable()
+        elif hooked and self.profiler == "tracemalloc" and not tracemalloc.is_tracing():
+            tracing = True
+            tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] = self.timings.get(name, 0.0) + time.perf_counter() - start
+            if profile:
+                profile.disable()
+                self.profiling = False
+                text = io.StringIO()
+                pstats.Stats(profile, stream=text).sort_stats("cumulative").print_stats(15)
+                self.profiles[name] = text.getvalue()
+            if tracing:
+                self.memory[name] = max(self.memory.get(name, 0), tracemalloc.get_traced_memory()[1])
+                tracemalloc.stop()
+
+    def count(self, name: str, value: int = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def peak(self, name: str, value: int) -> None:
+        self.counters[name] = max(self.counters.get(name, 0), value)
+
+    def as_dict(self) -> dict[str, dict]:
+        return {
+            "timings": dict(self.timings),
+            "counters": dict(self.counters),
+            "memory": dict(self.memory),
+        }
+
+    def report(self) -> str:
+        lines = ["=== Stats ==="]
+        for name, seconds in self.timings.items():
+            memory = f"  peak {self.memory[name] // 1024} KiB" if name in self.memory else ""
+            lines.append(f"{name:<12} {seconds * 1000:10.2f} ms{memory}")
+        for name, value in self.counters.items():
+            lines.append(f"{name:<20} {value}")
+        for name, text in self.profiles.items():
+            lines.append(f"--- cProfile: {name} ---")
+            lines.append(text.rstrip())
+        return "\n".join(lines)
@@ -0,0 +1,140 @@
+"""Reserved-cell stencils ("42" and any other pattern) stored as bitsets.
+
+A stencil is read from text (one row per line, '#', 'X', '1' or '█' mark a
+reserved cell, anything else is free) or from a PBM image (P1 or P4, black
+pixels are reserved). It can be scaled by whole factors and placed
+anywhere on a canvas. Placing works a row at a time with int bit
+operations, so big masks cost O(height) operations, not one per cell.
+"""
+
+from typing import Iterator
+from Canvas import Canvas
+from bitset import Bitset
+
+RESERVED_CHARS = "#X1█"
+
+
+class Stencil():
+    def __init__(self, width: int, height: int, bits: Bitset | None = None) -> None:
+        self.width = width
+        self.height = height
+        self.bits = bits or Bitset(width * height)
+
+    @classmethod
+    def from_rows(cls, rows: list[int], width: int) -> "Stencil":
+        """rows hold one int per row, bit x set when column x is reserved."""
+        stencil = cls(width, len(rows))
+        packed = 0
+        for y, row in enumerate(rows):
+            packed |= row << (y * width)
+        stencil.bits.bits[:] = packed.to_bytes(len(stencil.bits.bits), "little")
+        return stencil
+
+    @classmethod
+    def from_text(cls, text: str) -> "Stencil":
+        lines = [line.rstrip("\n") for line in text.splitlines()]
+        while lines and not lines[-1].strip():
+            lines.pop()
+        width = max((len(line) for line in lines), default=0)
+        table = str.maketrans({char: "1" if char in RESERVED_CHARS else "0" for char in set("".join(lines))})
+        return cls.from_rows([int(line.translate(table)[::-1] or "0", 2) for line in lines], width)
+
+    @classmethod
+    def from_pbm(cls, data: bytes) -> "Stencil":
+        # header tokens may be separated by any whitespace and "#" comments
+        tokens: list[bytes] = []
+        position = 0
+        while len(tokens) < 3:
+            while data[position:position + 1].isspace():
+                position += 1
+            if data[position:position + 1] == b"#":
+                position = data.index(b"\n", position)
+                continue
+            end = position
+            while end < len(data) and not data[end:end + 1].isspace():
+                end += 1
+            tokens.append(data[position:end])
+            position = end
+        magic, width, height = tokens[0], int(tokens[1]), int(tokens[2])
+        if magic == b"P4":
+            stride = (width + 7) // 8
+            pixels = data[position + 1:]
+            # P4 stores the leftmost pixel in the highest bit of each byte
+            rows = [int(format(int.from_bytes(pixels[y * stride:(y + 1) * stride], "big"), f"0{stride * 8}b")[:width][::-1], 2)
+                    for y in range(height)]
+        elif magic == b"P1":
+            digits = bytes(byte for byte in data[position:] if byte in b"01").decode("ascii")
+            rows = [int(digits[y * width:(y + 1) * width][::-1], 2) for y in range(height)]
+        else:
+            raise ValueError(f"unsupported PBM type {magic.decode('ascii', 'replace')!r}, expected P1 or P4")
+        return cls.from_rows(rows, width)
+
+    @classmethod
+    def from_file(cls, path: str) -> "Stencil":
+        with open(path, "rb") as file:
+            data = file.read()
+        if data[:2] in (b"P1", b"P4"):
+            return cls.from_pbm(data)
+        return cls.from_text(data.decode("utf-8"))
+
+    def row(self, y: int) -> int:
+        start = y * self.width
+        chunk = int.from_bytes(self.bits.bits[start >> 3:((start + self.width) >> 3) + 1], "little")
+        return chunk >> (start & 7) & ((1 << self.width) - 1)
+
+    def rows(self) -> Iterator[int]:
+        for y in range(self.height):
+            yield self.row(y)
+
+    def scaled(self, factor_x: int, factor_y: int | None = None) -> "Stencil":
+        factor_y = factor_y or factor_x
+        if factor_x == factor_y == 1:
+            return self
+        widen = str.maketrans({"0": "0" * factor_x, "1": "1" * factor_x})
+        rows = []
+        for row in self.rows():
+            wide = int(format(row, f"0{self.width}b").translate(widen), 2) if self.width else 0
+            rows.extend([wide] * factor_y)
+        return Stencil.from_rows(rows, self.width * factor_x)
+
+    def coordinates(self) -> Iterator[tuple[int, int]]:
+        for index in self.bits:
+            yield index % self.width, index // self.width
+
+    def origin(self, width: int, height: int) -> tuple[int, int]:
+        """Top-left corner that centres the stencil (same rounding as the "42")."""
+        return width // 2 - self.width // 2, height // 2 - self.height // 2
+
+    def place(self, canvas: Canvas, x: int | None = None, y: int | None = None) -> None:
+        """Reserve the stencil cells on canvas (centred by default); cells off the canvas are dropped."""
+        center_x, center_y = self.origin(canvas.width, canvas.height)
+        x = center_x if x is None else x
+        y = center_y if y is None else y
+        bits = canvas.ft.bits
+        for row_y, row in enumerate(self.rows()):
+            target_y = y + row_y
+            if not row or not 0 <= target_y < canvas.height:
+                continue
+            if x < 0:
+                row >>= -x
+            else:
+                row <<= x
+            row &= (1 << canvas.width) - 1
+            if not row:
+                continue
+            start = target_y * canvas.width
+            first, last = start >> 3, (start + canvas.width) >> 3
+            chunk = int.from_bytes(bits[first:last + 1], "little") | row << (start & 7)
+            bits[first:last + 1] = chunk.to_bytes(len(bits[first:last + 1]), "little")
+        # reserved cells are never visited by the generators
+        visited = canvas.visited.bits
+        visited[:] = (int.from_bytes(visited, "little") | int.from_bytes(bits, "little")).to_bytes(len(visited), "little")
+
+
+FORTY_TWO = Stencil.from_text(
+    "#...###\n"
+    "#.....#\n"
+    "###.###\n"
+    "..#.#..\n"
+    "..#.###\n"
+)
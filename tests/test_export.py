@@ -0,0 +1,144 @@
+import io
+import re
+import struct
+import xml.etree.ElementTree as ElementTree
+import zlib
+
+import pytest
+
+import export
+import maze_binary
+from MazeGenerator import MazeGenerator
+from output_writer import write_maze
+from walls import N, E, S, W
+
+WIDTH, HEIGHT = 11, 9
+
+
+@pytest.fixture
+def maze(tmp_path):
+    maze_generator = MazeGenerator(7)
+    maze_generator.set_canvas(WIDTH, HEIGHT, (0, 0), (WIDTH - 1, HEIGHT - 1))
+    maze_generator.set_renderer()
+    maze_generator.generate_maze()
+    maze_generator.solve_maze()
+    walls, solution = bytes(maze_generator.canvas.walls), maze_generator.renderer.solution
+    path = tmp_path / "maze.txt"
+    with open(path, "w") as file:
+        write_maze(file, walls, WIDTH, (0, 0), (WIDTH - 1, HEIGHT - 1), solution)
+    return str(path), walls, solution
+
+
+def rows(walls: bytes) -> list[bytes]:
+    return [walls[y * WIDTH:(y + 1) * WIDTH] for y in range(HEIGHT)]
+
+
+def expected_units(walls: bytes, solution: str) -> list[bytearray]:
+    """The PNG grid built cell by cell: walls, corners, closed cells, path, entry and exit."""
+    units = [bytearray(WIDTH * 2 + 1) for _ in range(HEIGHT * 2 + 1)]
+    for y in range(HEIGHT):
+        for x in range(WIDTH):
+            cell = walls[y * WIDTH + x]
+            grid_x, grid_y = x * 2 + 1, y * 2 + 1
+            if cell == 0xF:
+                units[grid_y][grid_x] = export.CLOSED
+            for side, dx, dy in ((N, 0, -1), (E, 1, 0), (S, 0, 1), (W, -1, 0)):
+                if cell & side:
+                    units[grid_y + dy][grid_x + dx] = export.WALL
+                    # the corners at both ends of the wall
+                    units[grid_y + dy + dx][grid_x + dx + dy] = export.WALL
+                    units[grid_y + dy - dx][grid_x + dx - dy] = export.WALL
+    x, y = 1, 1
+    for letter in solution:
+        dx, dy = export.MOVES[letter]
+        for _ in range(2):
+            x, y = x + dx, y + dy
+            units[y][x] = export.SOLUTION
+    units[1][1] = export.ENTRY
+    units[HEIGHT * 2 - 1][WIDTH * 2 - 1] = export.EXIT
+    return units
+
+
+def decode_png(data: bytes) -> tuple[int, int, list[bytes]]:
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    position, idat = 8, b""
+    while position < len(data):
+        length, kind = struct.unpack(">I4s", data[position:position + 8])
+        body = data[position + 8:position + 8 + length]
+        assert struct.unpack(">I", data[position + 8 + length:position + 12 + length])[0] == zlib.crc32(kind + body)
+        if kind == b"IHDR":
+            width, height = struct.unpack(">II", body[:8])
+        elif kind == b"IDAT":
+            idat += body
+        position += 12 + length
+    raw = zlib.decompress(idat)
+    lines = [raw[y * (width + 1):(y + 1) * (width + 1)] for y in range(height)]
+    assert all(line[0] == 0 for line in lines)
+    return width, height, [line[1:] for line in lines]
+
+
+@pytest.mark.parametrize("unit", [1, 3])
+def test_png_matches_grid(maze, unit):
+    _, walls, solution = maze
+    out = io.BytesIO()
+    export.write_png(out, rows(walls), WIDTH, HEIGHT, (0, 0), (WIDTH - 1, HEIGHT - 1), solution, unit)
+    width, height, pixels = decode_png(out.getvalue())
+    assert (width, height) == ((WIDTH * 2 + 1) * unit, (HEIGHT * 2 + 1) * unit)
+    units = [bytes(line[::unit]) for line in pixels[::unit]]
+    assert units == [bytes(line) for line in expected_units(walls, solution)]
+
+
+def svg_segments(svg: str, cell: int) -> set[tuple[int, int, int, int]]:
+    """Unit wall segments drawn by the wall <path>s, as (x1, y1, x2, y2) in cells."""
+    segments: set[tuple[int, int, int, int]] = set()
+    group = ElementTree.fromstring(svg).find("{http://www.w3.org/2000/svg}g")
+    assert group is not None
+    for path in group.iter("{http://www.w3.org/2000/svg}path"):
+        for x, y, kind, end in re.findall(r"M(-?\d+),(-?\d+)([hV])(-?\d+)", path.get("d", "")):
+            x, y, end = int(x) // cell, int(y) // cell, int(end) // cell
+            if kind == "h":
+                segments.update((x + step, y, x + step + 1, y) for step in range(end))
+            else:
+                segments.update((x, step, x, step + 1) for step in range(y, end))
+    return segments
+
+
+def test_svg_walls_and_solution(maze):
+    _, walls, solution = maze
+    out = io.StringIO()
+    export.write_svg(out, rows(walls), WIDTH, HEIGHT, (0, 0), (WIDTH - 1, HEIGHT - 1), solution, cell=10)
+    expected = set()
+    for y in range(HEIGHT):
+        for x in range(WIDTH):
+            cell = walls[y * WIDTH + x]
+            if cell & N:
+                expected.add((x, y, x + 1, y))
+            if cell & S:
+                expected.add((x, y + 1, x + 1, y + 1))
+            if cell & W:
+                expected.add((x, y, x, y + 1))
+            if cell & E:
+                expected.add((x + 1, y, x + 1, y + 1))
+    assert svg_segments(out.getvalue(), 10) == expected
+
+    overlay = re.search(r'stroke="#285adc"[^>]* d="([^"]*)"', out.getvalue()).group(1)
+    steps = re.findall(r"([hv])(-?\d+)", overlay)
+    assert overlay.startswith("M5,5")
+    assert sum(abs(int(length)) for _, length in steps) == len(solution) * 10
+
+
+def test_read_maze_hex_and_binary(maze, tmp_path):
+    path, walls, solution = maze
+    maze_binary.hex_to_binary(path, str(tmp_path / "maze.bin"))
+    for source in (path, str(tmp_path / "maze.bin")):
+        width, height, entry, exit, read_solution, maze_rows = export.read_maze(source)
+        assert (width, height, entry, exit, read_solution) == (WIDTH, HEIGHT, (0, 0), (WIDTH - 1, HEIGHT - 1), solution)
+        assert list(maze_rows) == rows(walls)
+
+
+@pytest.mark.parametrize("trailer", ["", "\n", "\n0,0\n", "\n0,0\nten,9\n"])
+def test_read_maze_bad_trailer(tmp_path, trailer):
+    path = tmp_path / "maze.txt"
+    path.write_text("93\nEE\n" + trailer)
+    with pytest.raises(ValueError, match="after the maze"):
+        export.read_maze(str(path))
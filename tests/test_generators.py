@@ -0,0 +1,47 @@
+import pytest
+
+import generators
+from MazeGenerator import MazeGenerator
+from maze_cache import MazeCache
+from walls import OPEN_COUNT
+
+
+def open_walls(walls: bytes) -> int:
+    return sum(OPEN_COUNT[cell] for cell in walls) // 2
+
+
+@pytest.mark.parametrize("tile_size", [3, 8, 64])
+def test_tiled_is_perfect_for_any_tile_size(tile_size):
+    maze_generator = MazeGenerator(5)
+    maze_generator.set_canvas(23, 17, (0, 0), (22, 16))
+    maze_generator.set_renderer()
+    maze_generator.tile_size = tile_size
+    maze_generator.generate_maze(algorithm="tiled")
+    canvas = maze_generator.canvas
+    free = len(canvas.walls) - canvas.ft.count()
+    assert open_walls(canvas.walls) == free - 1
+    assert not maze_generator.has_forbidden_opened_block()
+
+
+def test_tile_size_changes_the_maze_and_skips_the_cache():
+    cache = MazeCache()
+    mazes = []
+    for tile_size in (64, 8, 64):
+        maze_generator = MazeGenerator(5, cache)
+        maze_generator.set_canvas(23, 17, (0, 0), (22, 16))
+        maze_generator.set_renderer()
+        maze_generator.tile_size = tile_size
+        maze_generator.generate_maze(algorithm="tiled")
+        maze_generator.solve_maze()
+        mazes.append(bytes(maze_generator.canvas.walls))
+    assert mazes[0] != mazes[1]
+    assert mazes[0] == mazes[2]
+    assert cache.hits == 1
+
+
+def test_get_generator_options():
+    assert generators.get_generator("tiled", tile_size=4).keywords == {"tile_size": 4}
+    with pytest.raises(ValueError, match="does not take tile_size"):
+        generators.get_generator("dfs", tile_size=4)
+    with pytest.raises(ValueError, match="unknown generator"):
+        generators.get_generator("nope")
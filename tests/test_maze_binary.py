@@ -0,0 +1,54 @@
+import io
+
+import pytest
+
+import maze_binary
+from MazeGenerator import MazeGenerator
+from maze_binary import BinaryMaze
+from output_writer import format_row, iter_rows, write_maze
+
+
+def generated(width: int = 15, height: int = 9, seed: int = 42) -> MazeGenerator:
+    maze_generator = MazeGenerator(seed)
+    maze_generator.set_canvas(width, height, (0, 0), (width - 1, height - 1))
+    maze_generator.set_renderer()
+    maze_generator.generate_maze()
+    maze_generator.solve_maze()
+    return maze_generator
+
+
+@pytest.mark.parametrize("width", [15, 16])
+def test_hex_binary_round_trip(tmp_path, width):
+    maze_generator = generated(width)
+    walls, solution = bytes(maze_generator.canvas.walls), maze_generator.renderer.solution
+    source = tmp_path / "maze.txt"
+    with open(source, "w") as file:
+        write_maze(file, walls, width, (0, 0), (width - 1, 8), solution)
+
+    maze_binary.hex_to_binary(str(source), str(tmp_path / "maze.bin"), seed=-4)
+    with BinaryMaze(str(tmp_path / "maze.bin")) as maze:
+        assert (maze.width, maze.height, maze.entry, maze.exit) == (width, 9, (0, 0), (width - 1, 8))
+        assert maze.seed == -4
+        assert maze.solution() == solution
+        assert bytes(maze.walls()) == walls
+        assert [maze.hex_row(y) for y in range(9)] == [format_row(row) for row in iter_rows(walls, width)]
+
+    maze_binary.binary_to_hex(str(tmp_path / "maze.bin"), str(tmp_path / "back.txt"))
+    assert (tmp_path / "back.txt").read_text() == source.read_text()
+
+
+def test_seed_out_of_range(tmp_path):
+    with pytest.raises(ValueError, match="64-bit"):
+        maze_binary.write(str(tmp_path / "maze.bin"), bytes([0xF] * 4), 2, 2, (0, 0), (1, 1), seed=1 << 63)
+    assert not (tmp_path / "maze.bin").exists()
+
+
+def test_read_hex():
+    walls, width, height, entry, exit, solution = maze_binary.read_hex(io.StringIO("93\nEE\n\n0,0\n1,1\nES\n"))
+    assert (bytes(walls), width, height, entry, exit, solution) == (bytes([9, 3, 14, 14]), 2, 2, (0, 0), (1, 1), "ES")
+
+
+@pytest.mark.parametrize("text", ["93\nEE\n", "93\nEE\n\n0,0\n", "93\nEE\n\n0;0\n1,1\n"])
+def test_read_hex_bad_trailer(text):
+    with pytest.raises(ValueError, match="after the maze"):
+        maze_binary.read_hex(io.StringIO(text))
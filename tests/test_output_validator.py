@@ -0,0 +1,53 @@
+import pytest
+
+from MazeGenerator import MazeGenerator
+from output_validator import check_rows, check_walls, validate
+from output_writer import write_maze
+
+
+def generated(width: int, height: int, perfect: bool = True, seed: int = 3) -> MazeGenerator:
+    maze_generator = MazeGenerator(seed)
+    maze_generator.set_canvas(width, height, (0, 0), (width - 1, height - 1))
+    maze_generator.set_renderer()
+    maze_generator.generate_maze(perfect)
+    maze_generator.solve_maze()
+    return maze_generator
+
+
+def test_one_by_one_is_perfect(tmp_path):
+    assert list(check_rows(["F"], connected=True, perfect=True, open_area=True)) == []
+    path = tmp_path / "maze.txt"
+    path.write_text("F\n\n0,0\n0,0\n\n")
+    assert list(validate(str(path), connected=True, perfect=True, open_area=True, solution=True)) == []
+
+
+def test_two_cells():
+    assert list(check_rows(["D7"], perfect=True)) == []
+    assert list(check_rows(["FF"], perfect=True)) == []
+    assert list(check_rows(["AA"], perfect=True)) == ["Maze is not perfect: 0 open edges for 2 cells"]
+    assert list(check_rows(["9E"])) == ["Wrong encoding for (0,0)", "Wrong encoding for (1,0)"]
+
+
+@pytest.mark.parametrize("algorithm", ["dfs", "kruskal", "prim", "wilson"])
+def test_maze_with_forty_two(algorithm):
+    maze_generator = MazeGenerator(3)
+    maze_generator.set_canvas(15, 12, (0, 0), (14, 11))
+    maze_generator.set_renderer()
+    maze_generator.generate_maze(algorithm=algorithm)
+    canvas = maze_generator.canvas
+    # the "42" is there and stays fully closed
+    assert canvas.ft.count() == 18
+    assert all(canvas.walls[index] == 0xF for index in canvas.ft)
+    assert list(check_walls(canvas.walls, 15, connected=True, perfect=True, open_area=True)) == []
+
+
+def test_imperfect_maze_is_reported(tmp_path):
+    maze_generator = generated(15, 12, perfect=False)
+    canvas = maze_generator.canvas
+    errors = list(check_walls(canvas.walls, 15, connected=True, perfect=True))
+    assert len(errors) == 1 and errors[0].startswith("Maze is not perfect")
+
+    path = tmp_path / "maze.txt"
+    with open(path, "w") as file:
+        write_maze(file, canvas.walls, 15, canvas.entry, canvas.exit, maze_generator.renderer.solution)
+    assert list(validate(str(path), connected=True, open_area=True, solution=True)) == []
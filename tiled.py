@@ -0,0 +1,140 @@
+"""Tiled multi-core generation for very large mazes.
+
+The canvas is cut into tile_size x tile_size tiles. Worker processes carve
+a Kruskal spanning tree inside each tile straight into a shared-memory
+copy of the wall buffer. The tiles are then joined by a seeded Kruskal pass
+over the walls on tile borders, opening one wall per pair of tile areas,
+so the result is still a single spanning tree (a perfect maze).
+Reserved ("42") cells may cross tile borders: each tile reports the
+connected areas its border cells belong to, and the join works on those
+areas instead of whole tiles.
+"""
+
+import os
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from Canvas import Canvas
+from stats import Stats
+from walls import OPEN_SIDES
+import kruskal
+
+# Default tile edge, in cells.
+TILE_SIZE = 64
+
+def _carve_tile(name: str, width: int, height: int, x0: int, y0: int, tile_width: int, tile_height: int,
+                seed: str) -> list[tuple[int, int]]:
+    """Carve one tile into the shared buffer; return (global index, area) for its border cells."""
+    size = width * height
+    memory = shared_memory.SharedMemory(name=name)
+    buffer = memory.buf
+    assert buffer is not None
+    reserved = buffer[size:]
+    try:
+        tile = Canvas(tile_width, tile_height, (0, 0), (0, 0))
+        for y in range(tile_height):
+            for x in range(tile_width):
+                index = (y0 + y) * width + x0 + x
+                if reserved[index >> 3] >> (index & 7) & 1:
+                    local = y * tile_width + x
+                    tile.ft.add(local)
+                    tile.visited.add(local)
+        kruskal.generate_maze(tile, random.Random(seed))
+
+        for y in range(tile_height):
+            start = (y0 + y) * width + x0
+            buffer[start:start + tile_width] = tile.walls[y * tile_width:(y + 1) * tile_width]
+
+        # Label the areas of the tile and keep the labels of its border cells.
+        area = [-1] * len(tile.walls)
+        for first in range(len(tile.walls)):
+            if area[first] >= 0 or tile.ft[first]:
+                continue
+            area[first] = (y0 + first // tile_width) * width + x0 + first % tile_width
+            queue = deque([first])
+            while queue:
+                cell = queue.popleft()
+                for side in OPEN_SIDES[tile.walls[cell]]:
+                    neighbour = cell + tile.offset[side]
+                    if area[neighbour] < 0:
+                        area[neighbour] = area[first]
+                        queue.append(neighbour)
+
+        border = []
+        for y in range(tile_height):
+            for x in range(tile_width):
+                if (x in (0, tile_width - 1) or y in (0, tile_height - 1)) and area[y * tile_width + x] >= 0:
+                    border.append(((y0 + y) * width + x0 + x, area[y * tile_width + x]))
+        return border
+    finally:
+        reserved.release()
+        del buffer
+        memory.close()
+
+
+def generate_maze(canvas: Canvas, rng: random.Random, stats: Stats | None = None,
+                  tile_size: int = TILE_SIZE, workers: int | None = None) -> None:
+    if tile_size < 1:
+        raise ValueError(f"tile_size must be at least 1, got {tile_size}")
+    width, height = canvas.width, canvas.height
+    size = width * height
+    seed = rng.getrandbits(64)
+
+    # Shared buffer: wall masks followed by the reserved-cell bitset.
+    memory = shared_memory.SharedMemory(create=True, size=size + len(canvas.ft.bits))
+    buffer = memory.buf
+    assert buffer is not None
+    try:
+        buffer[:size] = canvas.walls
+        buffer[size:size + len(canvas.ft.bits)] = canvas.ft.bits
+
+        tiles = [(x0, y0, min(tile_size, width - x0), min(tile_size, height - y0))
+                 for y0 in range(0, height, tile_size) for x0 in range(0, width, tile_size)]
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            futures = [pool.submit(_carve_tile, memory.name, width, height, x0, y0, tile_width, tile_height,
+                                   f"{seed}:{x0}:{y0}:{tile_size}")
+                       for x0, y0, tile_width, tile_height in tiles]
+            labels: dict[int, int] = {}
+            for future in futures:
+                labels.update(future.result())
+
+        canvas.walls[:] = buffer[:size]
+    finally:
+        del buffer
+        memory.close()
+        memory.unlink()
+
+    # Walls across tile borders, between two non-reserved cells.
+    borders: list[tuple[int, int]] = []
+    for x0 in range(tile_size, width, tile_size):
+        for y in range(height):
+            index = y * width + x0 - 1
+            if index in labels and index + 1 in labels:
+                borders.append((index, index + 1))
+    for y0 in range(tile_size, height, tile_size):
+        for x in range(width):
+            index = (y0 - 1) * width + x
+            if index in labels and index + width in labels:
+                borders.append((index, index + width))
+    random.Random(seed).shuffle(borders)
+
+    parent: dict[int, int] = {}
+
+    def find(area: int) -> int:
+        while parent.get(area, area) != area:
+            parent[area] = parent.get(parent[area], parent[area])
+            area = parent[area]
+        return area
+
+    joined = 0
+    for index, neighbour in borders:
+        root, other = find(labels[index]), find(labels[neighbour])
+        if root != other:
+            parent[root] = other
+            canvas.remove_wall_at(index, neighbour)
+            joined += 1
+
+    if stats:
+        stats.count("tiles", len(tiles))
+        stats.count("tile_joins", joined)
@@ -0,0 +1,84 @@
+"""Per-shape geometry cache: neighbour masks, edge list and reserved cells.
+
+A Topology depends only on (width, height, reserved cells), so it is built
+once and shared by every canvas of that shape, across regenerations and
+batch runs. Tables are built with whole-array int/bytes operations.
+
+links[index] is a 4-bit mask of the sides that lead to an in-grid,
+non-reserved neighbour; LINKED_SIDES[mask] lists them in walls.SIDES order
+(the order the generators always used, so seeded mazes are unchanged).
+"""
+
+from array import array
+from collections import OrderedDict
+from itertools import compress
+from Canvas import Canvas
+from bitset import Bitset
+from walls import CLOSED_SIDES, N, E, S, W
+
+# Same bit per side as the wall masks: the linked sides of a mask are the
+# sides whose bit is set.
+LINKED_SIDES = CLOSED_SIDES
+_FLAG = {side: bytes(1 if mask & side else 0 for mask in range(16)) + bytes(240) for side in (N, E, S, W)}
+
+
+def _expand(bits: bytes | bytearray, size: int, value: int) -> bytes:
+    """One byte per cell: value where the bit is set, else 0."""
+    digits = format(int.from_bytes(bits, "little"), f"0{size}b")[::-1][:size]
+    return digits.encode("ascii").translate(bytes.maketrans(b"01", bytes([0, value])))
+
+
+class Topology():
+    def __init__(self, width: int, height: int, reserved: bytes | bytearray) -> None:
+        self.width = width
+        self.height = height
+        size = width * height
+        self.size = size
+        self.reserved = Bitset(size)
+        self.reserved.bits[:] = reserved
+        self.free = size - self.reserved.count()
+
+        # Sides inside the grid, by position.
+        row = bytearray([0xF]) * width
+        if width:
+            row[0] &= ~W
+            row[-1] &= ~E
+        grid = row * height
+        if height:
+            grid[:width] = bytes(mask & ~N for mask in grid[:width])
+            grid[size - width:] = bytes(mask & ~S for mask in grid[size - width:])
+
+        # Minus sides towards reserved cells, and everything of reserved cells.
+        packed = int.from_bytes(reserved, "little")
+        all_cells = (1 << size) - 1
+        blocked = int.from_bytes(_expand(reserved, size, 0xF), "little")
+        for side, shifted in ((E, packed >> 1), (W, packed << 1), (S, packed >> width), (N, packed << width)):
+            shifted &= all_cells
+            blocked |= int.from_bytes(_expand(shifted.to_bytes(len(reserved), "little"), size, side), "little")
+        links = (int.from_bytes(grid, "little") & ~blocked).to_bytes(size, "little")
+        self.links = links
+
+        # Edge list as in kruskal: index * 2 (wall to the EAST) or
+        # index * 2 + 1 (wall to the SOUTH), in index order.
+        flags = bytearray(2 * size)
+        flags[0::2] = links.translate(_FLAG[E])
+        flags[1::2] = links.translate(_FLAG[S])
+        self.edges = array("i", compress(range(2 * size), flags))
+
+
+_CACHE: OrderedDict[tuple[int, int, bytes], Topology] = OrderedDict()
+CACHE_SIZE = 8
+
+
+def get_topology(canvas: Canvas) -> Topology:
+    """Topology of the canvas' current shape and reserved cells (cached)."""
+    key = (canvas.width, canvas.height, bytes(canvas.ft.bits))
+    topology = _CACHE.get(key)
+    if topology is None:
+        topology = Topology(canvas.width, canvas.height, canvas.ft.bits)
+        _CACHE[key] = topology
+        while len(_CACHE) > CACHE_SIZE:
+            _CACHE.popitem(last=False)
+    else:
+        _CACHE.move_to_end(key)
+    return topology
@@ -0,0 +1,172 @@
+"""Whole-grid maze algorithms on a uint8 wall array (optional NumPy backend).
+
+Every algorithm draws all of its random numbers in one batched call and
+returns a (height, width) array using the encoding table in a_maze_ing.py.
+Reserved ("42") cells stay fully closed; components they cut off from the
+main tree are joined back with one extra opening each.
+"""
+
+from typing import Any, Callable
+from Canvas import Canvas
+from walls import N, E, S, W, CLOSED
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional
+    np = None  # type: ignore[assignment]
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError("the vectorized backend needs numpy (pip install numpy)")
+
+
+def _no_reserved(width: int, height: int) -> Any:
+    return np.zeros((height, width), dtype=bool)
+
+
+def _open_north(walls: Any, mask: Any) -> None:
+    # mask[y, x] opens the wall between (x, y) and (x, y - 1)
+    walls[mask] &= CLOSED ^ N
+    walls[:-1][mask[1:]] &= CLOSED ^ S
+
+
+def _open_east(walls: Any, mask: Any) -> None:
+    # mask[y, x] opens the wall between (x, y) and (x + 1, y)
+    walls[mask] &= CLOSED ^ E
+    walls[:, 1:][mask[:, :-1]] &= CLOSED ^ W
+
+
+def _join_forest(walls: Any, parent: Any, reserved: Any) -> None:
+    """Connect the trees of a parent forest by opening one wall between each pair."""
+    height, width = walls.shape
+    root = parent
+    while True:
+        jumped = root[root]
+        if np.array_equal(jumped, root):
+            break
+        root = jumped
+
+    free = ~reserved.ravel()
+    components = len(np.unique(root[free]))
+    if components <= 1:
+        return
+
+    index = np.arange(width * height).reshape(height, width)
+    candidates = []
+    for first, second, side in ((index[:, :-1], index[:, 1:], E), (index[:-1, :], index[1:, :], S)):
+        first, second = first.ravel(), second.ravel()
+        keep = free[first] & free[second] & (root[first] != root[second])
+        candidates.append((first[keep], second[keep], side))
+
+    flat = walls.reshape(-1)
+    joined: dict[int, int] = {}
+
+    def find(label: int) -> int:
+        while joined.get(label, label) != label:
+            label = joined[label]
+        return label
+
+    for firsts, seconds, side in candidates:
+        opposite = W if side == E else N
+        for a, b in zip(firsts.tolist(), seconds.tolist()):
+            root_a, root_b = find(int(root[a])), find(int(root[b]))
+            if root_a == root_b:
+                continue
+            joined[root_b] = root_a
+            flat[a] &= CLOSED ^ side
+            flat[b] &= CLOSED ^ opposite
+            components -= 1
+            if components == 1:
+                return
+
+
+def binary_tree(width: int, height: int, rng: Any, reserved: Any = None) -> Any:
+    """Each cell opens its north or east wall (one coin per cell)."""
+    _require_numpy()
+    if reserved is None:
+        reserved = _no_reserved(width, height)
+    coin = rng.random((height, width)) < 0.5
+
+    can_north = np.zeros((height, width), dtype=bool)
+    can_north[1:, :] = ~reserved[:-1, :]
+    can_east = np.zeros((height, width), dtype=bool)
+    can_east[:, :-1] = ~reserved[:, 1:]
+    can_north &= ~reserved
+    can_east &= ~reserved
+
+    go_north = can_north & (coin | ~can_east)
+    go_east = can_east & ~go_north
+
+    walls = np.full((height, width), CLOSED, dtype=np.uint8)
+    _open_north(walls, go_north)
+    _open_east(walls, go_east)
+
+    parent = np.arange(width * height)
+    parent[go_north.ravel()] -= width
+    parent[go_east.ravel()] += 1
+    _join_forest(walls, parent, reserved)
+    return walls
+
+
+def sidewinder(width: int, height: int, rng: Any, reserved: Any = None) -> Any:
+    """Rows are split into eastward runs; each run opens north from one random cell."""
+    _require_numpy()
+    if reserved is None:
+        reserved = _no_reserved(width, height)
+    coin, key = rng.random((2, height, width))
+
+    blocked_east = np.ones((height, width), dtype=bool)
+    blocked_east[:, :-1] = reserved[:, 1:]
+    close = blocked_east | reserved
+    close[1:, :] |= coin[1:, :] < 0.5
+
+    go_east = ~close
+    walls = np.full((height, width), CLOSED, dtype=np.uint8)
+    _open_east(walls, go_east)
+
+    # Runs never cross rows because the last column always closes.
+    start = np.ones((height, width), dtype=bool)
+    start[:, 1:] = close[:, :-1]
+    run = np.cumsum(start.ravel()) - 1
+
+    eligible = np.zeros((height, width), dtype=bool)
+    eligible[1:, :] = ~reserved[:-1, :]
+    eligible &= ~reserved
+    key = np.where(eligible, key, -1.0).ravel()
+
+    order = np.lexsort((key, run))
+    last = np.flatnonzero(np.diff(run[order], append=run[-1] + 1))
+    chosen = order[last]
+    has_exit = key[chosen] >= 0
+
+    go_north = np.zeros(width * height, dtype=bool)
+    go_north[chosen[has_exit]] = True
+    _open_north(walls, go_north.reshape(height, width))
+
+    first = np.flatnonzero(start.ravel())
+    target = np.where(has_exit, chosen - width, first)
+    parent = target[run]
+    parent[reserved.ravel()] = np.flatnonzero(reserved.ravel())
+    _join_forest(walls, parent, reserved)
+    return walls
+
+
+ALGORITHMS: dict[str, Callable[..., Any]] = {
+    "binary_tree": binary_tree,
+    "sidewinder": sidewinder,
+}
+
+
+def reserved_mask(canvas: Canvas) -> Any:
+    _require_numpy()
+    bits = np.unpackbits(np.frombuffer(bytes(canvas.ft.bits), dtype=np.uint8), bitorder="little")
+    return bits[:canvas.width * canvas.height].astype(bool).reshape(canvas.height, canvas.width)
+
+
+def carve_canvas(canvas: Canvas, algorithm: str = "binary_tree", seed: int | None = None) -> None:
+    """Fill canvas.walls with a whole-grid algorithm, keeping its "42" cells closed."""
+    _require_numpy()
+    rng = np.random.default_rng(seed)
+    walls = ALGORITHMS[algorithm](canvas.width, canvas.height, rng, reserved_mask(canvas))
+    canvas.walls[:] = walls.tobytes()
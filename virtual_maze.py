@@ -0,0 +1,145 @@
+"""Virtual mazes: regions are generated on demand from (seed, region) only.
+
+Each region_size x region_size region is a Kruskal spanning tree seeded by
+its own coordinates. Regions are linked with a binary tree over the region
+grid: every region opens one wall to its north or east neighbour, at an
+offset also derived from the seed. Any region can therefore be rebuilt
+alone and still agree with its neighbours, and the whole maze is perfect.
+Only a bounded LRU of regions is kept, so memory follows the viewport and
+not the maze area. The "42" stencil is not drawn in virtual mazes.
+Usage: python3 virtual_maze.py [width height [seed]]
+"""
+
+import random
+import sys
+from collections import OrderedDict
+from Canvas import Canvas
+from output_writer import format_row
+from renderer import Renderer
+from walls import N, E, S, W
+import kruskal
+
+
+class VirtualMaze():
+    def __init__(self, width: int, height: int, seed: int, region_size: int = 64, max_regions: int = 256) -> None:
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.region_size = region_size
+        self.max_regions = max_regions
+        self.regions_x = -(-width // region_size)
+        self.regions_y = -(-height // region_size)
+        self.regions: OrderedDict[tuple[int, int], bytearray] = OrderedDict()
+        self.entry = (0, 0)
+        self.exit = (width - 1, height - 1)
+
+    def region_shape(self, rx: int, ry: int) -> tuple[int, int]:
+        size = self.region_size
+        return min(size, self.width - rx * size), min(size, self.height - ry * size)
+
+    def link(self, rx: int, ry: int) -> tuple[int, int] | None:
+        """(side, offset) of the wall region (rx, ry) opens to its N or E neighbour."""
+        last_column = rx == self.regions_x - 1
+        if ry == 0 and last_column:
+            return None
+        rng = random.Random(f"{self.seed}:link:{rx}:{ry}")
+        if ry == 0:
+            side = E
+        elif last_column:
+            side = N
+        else:
+            side = N if rng.random() < 0.5 else E
+        region_width, region_height = self.region_shape(rx, ry)
+        return side, rng.randrange(region_width if side == N else region_height)
+
+    def build_region(self, rx: int, ry: int) -> bytearray:
+        region_width, region_height = self.region_shape(rx, ry)
+        canvas = Canvas(region_width, region_height, (0, 0), (0, 0))
+        kruskal.generate_maze(canvas, random.Random(f"{self.seed}:region:{rx}:{ry}"))
+        walls = canvas.walls
+
+        own = self.link(rx, ry)
+        if own:
+            side, offset = own
+            walls[offset if side == N else offset * region_width + region_width - 1] &= ~side
+        if ry + 1 < self.regions_y and (below := self.link(rx, ry + 1)) and below[0] == N:
+            walls[(region_height - 1) * region_width + below[1]] &= ~S
+        if rx > 0 and (left := self.link(rx - 1, ry)) and left[0] == E:
+            walls[left[1] * region_width] &= ~W
+        return walls
+
+    def region(self, rx: int, ry: int) -> bytearray:
+        key = (rx, ry)
+        if key in self.regions:
+            self.regions.move_to_end(key)
+            return self.regions[key]
+        walls = self.build_region(rx, ry)
+        self.regions[key] = walls
+        while len(self.regions) > self.max_regions:
+            self.regions.popitem(last=False)
+        return walls
+
+    def cell(self, x: int, y: int) -> int:
+        size = self.region_size
+        region_width = self.region_shape(x // size, y // size)[0]
+        return self.region(x // size, y // size)[(y % size) * region_width + x % size]
+
+    def window(self, x: int, y: int, width: int, height: int) -> bytearray:
+        """Wall masks of a rectangle, row-major, clipped to the maze."""
+        x, y = max(0, x), max(0, y)
+        width, height = min(width, self.width - x), min(height, self.height - y)
+        size = self.region_size
+        cells = bytearray()
+        for row in range(y, y + height):
+            column = x
+            while column < x + width:
+                rx, ry = column // size, row // size
+                region_width = self.region_shape(rx, ry)[0]
+                start = (row % size) * region_width + column % size
+                take = min(region_width - column % size, x + width - column)
+                cells += self.region(rx, ry)[start:start + take]
+                column += take
+        return cells
+
+    def hex_rows(self, x: int, y: int, width: int, height: int) -> list[str]:
+        width = min(width, self.width - max(0, x))
+        cells = self.window(x, y, width, height)
+        return [format_row(cells[start:start + width]) for start in range(0, len(cells), width)]
+
+
+def show_window(renderer: Renderer, maze: VirtualMaze, x: int, y: int) -> None:
+    """Scroll renderer (sized to the viewport) so its top-left cell is (x, y) and draw it."""
+    entry = (maze.entry[0] - x, maze.entry[1] - y)
+    exit = (maze.exit[0] - x, maze.exit[1] - y)
+    renderer.scroll(list(maze.window(x, y, renderer.width, renderer.height)), entry, exit)
+    renderer.render_maze()
+
+
+def browse(maze: VirtualMaze, width: int = 30, height: int = 15) -> None:
+    width, height = min(width, maze.width), min(height, maze.height)
+    renderer = Renderer(width, height, maze.entry, maze.exit, [], "")
+    x = y = 0
+    moves = {"w": (0, -1), "a": (-1, 0), "s": (0, 1), "d": (1, 0)}
+    try:
+        while True:
+            show_window(renderer, maze, x, y)
+            print(f"\n({x},{y}) of {maze.width}x{maze.height} - regions cached: {len(maze.regions)}")
+            choice = input("Move (w/a/s/d), q to quit: ").strip().lower()
+            if choice == "q":
+                print("Bye!")
+                break
+            if choice in moves:
+                dx, dy = moves[choice]
+                x = min(max(0, x + dx * (width // 2)), maze.width - width)
+                y = min(max(0, y + dy * (height // 2)), maze.height - height)
+    except KeyboardInterrupt:
+        print("\nBye!")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) not in (1, 3, 4):
+        print(f"Usage: python3 {sys.argv[0]} [width height [seed]]")
+        sys.exit(1)
+    width, height = (int(sys.argv[1]), int(sys.argv[2])) if len(sys.argv) > 1 else (10 ** 6, 10 ** 6)
+    seed = int(sys.argv[3]) if len(sys.argv) == 4 else 42
+    browse(VirtualMaze(width, height, seed))
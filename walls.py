@@ -0,0 +1,57 @@
+"""Integer wall masks and lookup tables (see the encoding table in a_maze_ing.py)."""
+
+# Closed wall sets bit to 1, open - 0
+N = 1
+E = 2
+S = 4
+W = 8
+
+OPENED = 0x0
+CLOSED = 0xF
+
+# Neighbour scan order used by the generators, kept stable so that a given
+# seed always produces the same maze.
+SIDES = (W, E, N, S)
+
+# Tables indexed by side bit.
+OPPOSITE = [0] * 9
+OPPOSITE[N], OPPOSITE[E], OPPOSITE[S], OPPOSITE[W] = S, W, N, E
+
+DX = [0] * 9
+DY = [0] * 9
+DX[E], DX[W] = 1, -1
+DY[N], DY[S] = -1, 1
+
+# Tables indexed by wall mask (0x0 - 0xF).
+OPEN_SIDES: list[tuple[int, ...]] = [tuple(side for side in SIDES if not mask & side) for mask in range(16)]
+CLOSED_SIDES: list[tuple[int, ...]] = [tuple(side for side in SIDES if mask & side) for mask in range(16)]
+OPEN_COUNT: list[int] = [len(sides) for sides in OPEN_SIDES]
+
+
+def offsets(width: int) -> list[int]:
+    """Flat-index delta to the neighbour behind each side, indexed by side bit."""
+    offset = [0] * 9
+    offset[N], offset[E], offset[S], offset[W] = -width, 1, width, -1
+    return offset
+
+
+# Two cells per byte, first cell in the high nibble.
+_HIGH = bytes.maketrans(bytes(range(16)), bytes(value << 4 for value in range(16)))
+_UNPACK_HIGH = bytes(value >> 4 for value in range(256))
+_UNPACK_LOW = bytes(value & 0xF for value in range(256))
+
+
+def pack_nibbles(cells: bytes | bytearray | memoryview) -> bytes:
+    cells = bytes(cells)
+    high = cells[0::2].translate(_HIGH)
+    low = cells[1::2].ljust(len(high), b"\0")
+    return (int.from_bytes(high, "big") | int.from_bytes(low, "big")).to_bytes(len(high), "big")
+
+
+def unpack_nibbles(packed: bytes | bytearray | memoryview, count: int) -> bytearray:
+    packed = bytes(packed)
+    cells = bytearray(len(packed) * 2)
+    cells[0::2] = packed.translate(_UNPACK_HIGH)
+    cells[1::2] = packed.translate(_UNPACK_LOW)
+    del cells[count:]
+    return cells
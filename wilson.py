@@ -0,0 +1,60 @@
+from collections import deque
+from Canvas import Canvas
+from bitset import Bitset
+from stats import Stats
+from topology import LINKED_SIDES, get_topology
+import random
+
+
+def generate_maze(canvas: Canvas, rng: random.Random, stats: Stats | None = None) -> None:
+    """Wilson's algorithm: loop-erased random walks give a uniform spanning tree."""
+    size = len(canvas.walls)
+    offset = canvas.offset
+    topology = get_topology(canvas)
+    links = topology.links
+    in_tree = Bitset(size).bits
+    exit_side = bytearray(size)
+
+    # One root per connected area of free cells, or a walk could never
+    # reach the tree.
+    cells = [index for index in range(size) if not topology.reserved[index]]
+    seen = Bitset(size).bits
+    for index in cells:
+        if seen[index >> 3] >> (index & 7) & 1:
+            continue
+        area = [index]
+        seen[index >> 3] |= 1 << (index & 7)
+        queue = deque([index])
+        while queue:
+            cell = queue.popleft()
+            for side in LINKED_SIDES[links[cell]]:
+                neighbour = cell + offset[side]
+                if not seen[neighbour >> 3] >> (neighbour & 7) & 1:
+                    seen[neighbour >> 3] |= 1 << (neighbour & 7)
+                    area.append(neighbour)
+                    queue.append(neighbour)
+        root = rng.choice(area)
+        in_tree[root >> 3] |= 1 << (root & 7)
+
+    rng.shuffle(cells)
+    steps = removed = 0
+    for start in cells:
+        # Walk until the tree is hit, remembering only the last exit of
+        # each cell: following those exits afterwards erases the loops.
+        index = start
+        while not in_tree[index >> 3] >> (index & 7) & 1:
+            side = rng.choice(LINKED_SIDES[links[index]])
+            exit_side[index] = side
+            index += offset[side]
+            steps += 1
+
+        index = start
+        while not in_tree[index >> 3] >> (index & 7) & 1:
+            in_tree[index >> 3] |= 1 << (index & 7)
+            canvas.remove_wall_side(index, exit_side[index])
+            removed += 1
+            index += offset[exit_side[index]]
+
+    if stats:
+        stats.count("walk_steps", steps)
+        stats.count("walls_removed", removed)